@@ -1,50 +1,99 @@
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 
 # -----------------------------------------------------------------------------
 # DIRECTORY PATHS
 # -----------------------------------------------------------------------------
 # Define project-wide paths to ensure consistency.
-PROJECT_ROOT = Path(__file__).parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "outputs"
 REPORTS_DIR = OUTPUT_DIR / "reports"
 SRC_DIR = PROJECT_ROOT / "src"
 
-# Create necessary directories on startup if they don't exist.
-OUTPUT_DIR.mkdir(exist_ok=True)
-REPORTS_DIR.mkdir(exist_ok=True)
+
+def ensure_output_dirs():
+    """Creates the output and report directories if they don't exist.
+
+    This is intentionally not done at import time, so that importing the
+    settings (e.g. on every Airflow DAG parse) does not touch the filesystem.
+    """
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    REPORTS_DIR.mkdir(exist_ok=True)
+
 
 # --------------------- --------------------------------------------------------
 # MARKET CONFIGURATIONS
 # -----------------------------------------------------------------------------
-# This dictionary holds the specific configurations for each market.
+# Each market is described by an immutable `MarketConfig`:
+# - 'name': The market key, also used to name its output files.
 # - 'base_url': The starting URL for the scraper.
 # - 'processor': The name of the data processor to use.
 # - 'default_total_limit': A default safety limit for the number of products.
 # - 'default_per_page_limit': The default number of items to request per page.
 # -----------------------------------------------------------------------------
-MARKET_CONFIGS = {
-    "vero": {
-        "base_url": "https://pricelist.vero.com.mk/",
-        "processor": "Vero",
-        "default_total_limit": 50,
-        "default_per_page_limit": 1,
-    },
-    "zito": {
-        "base_url": "https://zito.proverkanaceni.mk/index.php",
-        "processor": "Standard",
-        "default_total_limit": 50,
-        "default_per_page_limit": 1,
-    },
-    "tinex": {
-        "base_url": "https://ceni.tinex.mk:442/index.php",
-        "processor": "Standard",
-        "default_total_limit": 50,
-        "default_per_page_limit": 1,
-    },
-    "stokomak": {
-        "base_url": "https://stokomak.proverkanaceni.mk/",
-        "processor": "Standard",
-        "default_total_limit": 50,
-        "default_per_page_limit": 1,
-    },
-}
+@dataclass(frozen=True)
+class MarketConfig:
+    """Static, read-only configuration for a single market.
+
+    The per-market output paths used by the pipeline tasks are derived once
+    from the market name when the configuration is created.
+    """
+
+    name: str
+    base_url: str
+    processor: str
+    default_total_limit: int
+    default_per_page_limit: int
+    processed_path: Path = field(init=False)
+    validated_path: Path = field(init=False)
+    analytics_report_path: Path = field(init=False)
+
+    def __post_init__(self):
+        # The dataclass is frozen, so derived fields are set via object.__setattr__.
+        object.__setattr__(
+            self, "processed_path", OUTPUT_DIR / f"{self.name}_processed_data.parquet"
+        )
+        object.__setattr__(
+            self, "validated_path", OUTPUT_DIR / f"{self.name}_validated_data.parquet"
+        )
+        object.__setattr__(
+            self,
+            "analytics_report_path",
+            REPORTS_DIR / f"{self.name}_summary_analytics_report.json",
+        )
+
+
+# A read-only view over the configurations, built once at import time.
+MARKET_CONFIGS = MappingProxyType(
+    {
+        "vero": MarketConfig(
+            name="vero",
+            base_url="https://pricelist.vero.com.mk/",
+            processor="Vero",
+            default_total_limit=50,
+            default_per_page_limit=1,
+        ),
+        "zito": MarketConfig(
+            name="zito",
+            base_url="https://zito.proverkanaceni.mk/index.php",
+            processor="Standard",
+            default_total_limit=50,
+            default_per_page_limit=1,
+        ),
+        "tinex": MarketConfig(
+            name="tinex",
+            base_url="https://ceni.tinex.mk:442/index.php",
+            processor="Standard",
+            default_total_limit=50,
+            default_per_page_limit=1,
+        ),
+        "stokomak": MarketConfig(
+            name="stokomak",
+            base_url="https://stokomak.proverkanaceni.mk/",
+            processor="Standard",
+            default_total_limit=50,
+            default_per_page_limit=1,
+        ),
+    }
+)
@@ -16,27 +16,43 @@ The pipeline supports multiple markets that can be configured through the MARKET
 Each market can be configured with specific scraping limits, browser settings,
 and processing parameters through the MARKET_CONFIGS in settings.py.
 """
+import functools
 import logging
-import os
-import sys
 from datetime import datetime, timedelta
 
-import pandas as pd
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 
-# Add the project root to the Python path to allow importing project modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Only the market configuration is needed to build the DAGs. The heavy project
+# modules (pandas, Selenium, processors, ...) are imported inside the task
+# callables so that the scheduler does not pay for them on every file parse.
+from config.settings import MARKET_CONFIGS, MarketConfig, ensure_output_dirs
 
-from config.settings import MARKET_CONFIGS
-from src.processors import get_data_processor
-from src.scrapers.factory import get_market_scraper
-from src.validators.data_validator import DataValidator
-from src.reporting.analytics import generate_summary_analytics
+# Set once the output directories have been created in this process, so the
+# tasks only hit the filesystem the first time.
+_dirs_ready = False
 
 # --- Task Functions (remain the same, but are now more generic) ---
 
 
+def _ensure_output_dirs_once():
+    """Creates the output directories on the first call in this process."""
+    global _dirs_ready
+    if not _dirs_ready:
+        ensure_output_dirs()
+        _dirs_ready = True
+
+
+def _supports_in_memory_xcom(ti) -> bool:
+    """Whether the task instance can pass Python objects (e.g. DataFrames) via XCom.
+
+    Real Airflow serializes XComs into its metadata database, so DataFrames are
+    only handed over in memory for local runs (see `MockTaskInstance`). The
+    file-based handoff is always written and used as the fallback.
+    """
+    return getattr(ti, "in_memory_xcom", False)
+
+
 def scrape_data_task(market_name: str, browser: str, headless: bool, **kwargs):
     """Scrapes data for a given market using the configured scraper.
 
@@ -53,9 +69,11 @@ def scrape_data_task(market_name: str, browser: str, headless: bool, **kwargs):
     Raises:
         ValueError: If scraping fails or no output files are produced.
     """
+    from src.scrapers.factory import get_market_scraper
+
     # Read params from the DAG run configuration for manual runs
     params = kwargs.get("params", {})
-    # Prioritize manual 'params', but fall back to the default op_kwargs value.
+    # Prioritize manual 'params', but fall back to the default bound in the DAG.
     total_limit = params.get("total_limit", kwargs.get("total_limit"))
     per_page_limit = params.get("per_page_limit", kwargs.get("per_page_limit"))
 
@@ -67,7 +85,7 @@ def scrape_data_task(market_name: str, browser: str, headless: bool, **kwargs):
 
     with get_market_scraper(
         market_name=market_name,
-        base_url=config["base_url"],
+        base_url=config.base_url,
         browser=browser,
         headless=headless,
         total_limit=total_limit,
@@ -89,7 +107,7 @@ def process_data_task(market_name: str, **kwargs):
     """Processes raw scraped data for a given market using the configured data processor.
 
     This task retrieves the raw data file path from XCom, processes the data using
-    the market-specific processor, and saves the processed data to a CSV file.
+    the market-specific processor, and saves the processed data to a Parquet file.
     The processed data file path is stored in XCom for downstream tasks.
 
     Args:
@@ -100,17 +118,22 @@ def process_data_task(market_name: str, **kwargs):
         ValueError: If the raw data file is not found or invalid.
         ValueError: If processing results in an empty DataFrame.
     """
+    from src.processors import get_data_processor
+
     ti = kwargs["ti"]
     raw_data_path = ti.xcom_pull(
         key=f"{market_name}_raw_data_path", task_ids=f"scrape_{market_name}_data"
     )
     logging.info(f"Processing data for {market_name} from: {raw_data_path}")
 
-    if not raw_data_path or not os.path.exists(raw_data_path):
+    # A missing file is reported by the processor, which then returns an empty
+    # DataFrame and fails the task below, so there is no need to stat it here.
+    if not raw_data_path:
         raise ValueError(
             f"Raw data file for {market_name} not found or path is invalid."
         )
 
+    _ensure_output_dirs_once()
     processor = get_data_processor(market_name)
     processed_df = processor.process_market_data(raw_data_path)
 
@@ -119,19 +142,25 @@ def process_data_task(market_name: str, **kwargs):
             f"Processing for {market_name} resulted in an empty DataFrame."
         )
 
-    processed_data_path = f"outputs/{market_name}_processed_data.csv"
-    processed_df.to_csv(processed_data_path, index=False, encoding="utf-8")
+    processed_data_path = MARKET_CONFIGS[market_name].processed_path
+    processed_df.to_parquet(processed_data_path, compression="snappy", index=False)
 
-    ti.xcom_push(key=f"{market_name}_processed_data_path", value=processed_data_path)
+    ti.xcom_push(
+        key=f"{market_name}_processed_data_path", value=str(processed_data_path)
+    )
+    if _supports_in_memory_xcom(ti):
+        ti.xcom_push(key=f"{market_name}_processed_df", value=processed_df)
 
 
-def validate_data_task(market_name: str, **kwargs):
-    """Validates processed data for a given market using the data validator.
+def validate_and_report_task(market_name: str, **kwargs):
+    """Validates processed data for a given market and generates its analytics report.
 
     This task retrieves the processed data file path from XCom, validates the data
-    using the DataValidator, and saves the validated data to a CSV file. If no data
-    remains after validation, it pushes None to XCom to indicate that downstream
-    tasks should be skipped.
+    using the DataValidator, and saves the validated data to a Parquet file. The
+    validated DataFrame is then passed straight to the analytics step, which writes
+    the summary report in JSON format, avoiding a write/read round trip between two
+    separate tasks. If no data remains after validation, it pushes None to XCom and
+    skips the report.
 
     Args:
         market_name: The name of the market to validate data for (e.g., 'vero', 'stokomak').
@@ -140,72 +169,80 @@ def validate_data_task(market_name: str, **kwargs):
     Raises:
         ValueError: If the processed data file is not found.
     """
+    import pandas as pd
+    from src.validators.data_validator import DataValidator
+    from src.reporting.analytics import generate_summary_analytics
+
     ti = kwargs["ti"]
     processed_data_path = ti.xcom_pull(
         key=f"{market_name}_processed_data_path", task_ids=f"process_{market_name}_data"
     )
     logging.info(f"Validating data for {market_name} from: {processed_data_path}")
 
-    if not processed_data_path or not os.path.exists(processed_data_path):
-        raise ValueError(f"Processed data file for {market_name} not found.")
+    df = None
+    if _supports_in_memory_xcom(ti):
+        df = ti.xcom_pull(
+            key=f"{market_name}_processed_df", task_ids=f"process_{market_name}_data"
+        )
 
-    df = pd.read_csv(processed_data_path)
+    if not isinstance(df, pd.DataFrame):
+        if not processed_data_path:
+            raise ValueError(f"Processed data file for {market_name} not found.")
+        try:
+            df = pd.read_parquet(processed_data_path)
+        except FileNotFoundError as e:
+            raise ValueError(
+                f"Processed data file for {market_name} not found."
+            ) from e
+
+    _ensure_output_dirs_once()
     validator = DataValidator()
     validated_df = validator.validate(df, market_name)
 
     if validated_df.empty:
-        logging.warning(f"No data remained for {market_name} after validation.")
-        # Push None to indicate no further steps should run for this market
+        logging.warning(
+            f"No data remained for {market_name} after validation. Skipping analytics."
+        )
         ti.xcom_push(key=f"{market_name}_validated_data_path", value=None)
         return
 
-    validated_data_path = f"outputs/{market_name}_validated_data.csv"
-    validated_df.to_csv(validated_data_path, index=False, encoding="utf-8")
-    ti.xcom_push(key=f"{market_name}_validated_data_path", value=validated_data_path)
-
-
-def generate_analytics_report_task(market_name: str, **kwargs):
-    """Generates analytics report for validated data of a given market.
-
-    This task retrieves the validated data file path from XCom, reads the data,
-    and generates a summary analytics report in JSON format. If no validated data
-    is available, the task logs a warning and exits gracefully.
-
-    Args:
-        market_name: The name of the market to generate analytics for (e.g., 'vero', 'stokomak').
-        **kwargs: Additional keyword arguments including Airflow context.
-    """
-    ti = kwargs["ti"]
-    validated_data_path = ti.xcom_pull(
+    market_config = MARKET_CONFIGS[market_name]
+    validated_df.to_parquet(
+        market_config.validated_path, compression="snappy", index=False
+    )
+    ti.xcom_push(
         key=f"{market_name}_validated_data_path",
-        task_ids=f"validate_{market_name}_data",
+        value=str(market_config.validated_path),
     )
 
-    if not validated_data_path:
-        logging.warning(
-            f"No validated data path found for {market_name}. Skipping analytics."
-        )
-        return
-
-    df = pd.read_csv(validated_data_path)
-    report_path = f"outputs/reports/{market_name}_summary_analytics_report.json"
-    generate_summary_analytics(df, report_path)
+    generate_summary_analytics(validated_df, market_config.analytics_report_path)
 
 
 # --- DAG Generation Loop ---
 
+# Shared by every market DAG. Airflow copies it per DAG, so it is never mutated.
+DEFAULT_ARGS = {
+    "owner": "airflow",
+    "depends_on_past": False,
+    "start_date": datetime(2025, 6, 22),
+    "email_on_failure": False,
+    "email_on_retry": False,
+    "retries": 1,
+    "retry_delay": timedelta(minutes=2),
+}
+
 
-def create_dag(market_name: str, market_config: dict):
+def create_dag(market_name: str, market_config: MarketConfig):
     """Creates an Airflow DAG for a specific market's data pipeline.
 
-    This function dynamically creates a complete DAG with four sequential tasks:
-    scraping, processing, validation, and analytics generation. The DAG is configured
+    This function dynamically creates a complete DAG with three sequential tasks:
+    scraping, processing, and validation followed by analytics generation. The DAG is configured
     with appropriate scheduling, retry logic, and task dependencies.
 
     Args:
         market_name: The name of the market to create a DAG for (e.g., 'vero', 'stokomak').
-        market_config: Dictionary containing market-specific configuration including
-                      base_url, default_total_limit, and default_per_page_limit.
+        market_config: The market-specific configuration including base_url,
+                      default_total_limit, and default_per_page_limit.
 
     Returns:
         DAG: A configured Airflow DAG instance for the specified market.
@@ -213,57 +250,43 @@ def create_dag(market_name: str, market_config: dict):
 
     dag_id = f"supermarket_data_pipeline_{market_name}"
 
-    default_args = {
-        "owner": "airflow",
-        "depends_on_past": False,
-        "start_date": datetime(2025, 6, 22),
-        "email_on_failure": False,
-        "email_on_retry": False,
-        "retries": 1,
-        "retry_delay": timedelta(minutes=2),
-    }
-
     dag = DAG(
         dag_id=dag_id,
-        default_args=default_args,
+        default_args=DEFAULT_ARGS,
         description=f"A data pipeline for the {market_name.title()} supermarket.",
         schedule_interval=timedelta(days=1),
         catchup=False,
         tags=["data-pipeline", "scraping", market_name],
     )
 
+    # The static task arguments are bound into the callables up front instead of
+    # being passed as (templated) op_kwargs on every parse.
     with dag:
         scrape_task = PythonOperator(
             task_id=f"scrape_{market_name}_data",
-            python_callable=scrape_data_task,
-            op_kwargs={
-                "market_name": market_name,
-                "browser": "chrome",
-                "headless": True,
-                "total_limit": market_config["default_total_limit"],
-                "per_page_limit": market_config["default_per_page_limit"],
-            },
+            python_callable=functools.partial(
+                scrape_data_task,
+                market_name=market_name,
+                browser="chrome",
+                headless=True,
+                total_limit=market_config.default_total_limit,
+                per_page_limit=market_config.default_per_page_limit,
+            ),
         )
 
         process_task = PythonOperator(
             task_id=f"process_{market_name}_data",
-            python_callable=process_data_task,
-            op_kwargs={"market_name": market_name},
-        )
-
-        validate_task = PythonOperator(
-            task_id=f"validate_{market_name}_data",
-            python_callable=validate_data_task,
-            op_kwargs={"market_name": market_name},
+            python_callable=functools.partial(process_data_task, market_name=market_name),
         )
 
-        analytics_task = PythonOperator(
-            task_id=f"generate_{market_name}_analytics_report",
-            python_callable=generate_analytics_report_task,
-            op_kwargs={"market_name": market_name},
+        validate_and_report_task_op = PythonOperator(
+            task_id=f"validate_and_report_{market_name}_data",
+            python_callable=functools.partial(
+                validate_and_report_task, market_name=market_name
+            ),
         )
 
-        scrape_task >> process_task >> validate_task >> analytics_task
+        scrape_task >> process_task >> validate_and_report_task_op
 
     return dag
 
@@ -6,14 +6,22 @@ and then runs the scraping process.
 """
 import logging
 import argparse
-from src.scrapers.factory import get_market_scraper
-from src.processors import get_data_processor
-from src.validators.data_validator import DataValidator
-from src.reporting.analytics import generate_summary_analytics
-from config.settings import MARKET_CONFIGS  # Import the configurations
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import TYPE_CHECKING
+from config.settings import (  # Import the configurations
+    MARKET_CONFIGS,
+    OUTPUT_DIR,
+    ensure_output_dirs,
+)
 import os
 
+# The heavy dependencies (Selenium, pandas, pyarrow and the project modules built
+# on them) are imported inside the functions that need them, so that argument
+# parsing (e.g. `--help`) and early exits stay fast.
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def setup_logging():
     """Sets up basic logging for the script.
@@ -27,6 +35,24 @@ def setup_logging():
     )
 
 
+def process_raw_file(market_name: str, raw_file_path: str) -> "pd.DataFrame":
+    """Processes a single raw data file with the market's data processor.
+
+    This is a module-level function so that it can be pickled and run in a
+    worker process when several raw files are processed in parallel.
+
+    Args:
+        market_name: The name of the market the file belongs to.
+        raw_file_path: The path to the raw data file.
+
+    Returns:
+        The processed DataFrame (possibly empty).
+    """
+    from src.processors import get_data_processor
+
+    return get_data_processor(market_name).process_market_data(raw_file_path)
+
+
 def main():
     """Parses command-line arguments and runs the specified market scraper.
 
@@ -79,15 +105,18 @@ def main():
         return
 
     setup_logging()
+    ensure_output_dirs()
     logging.info(
         f"Starting scraper for '{args.market}' with a limit of {args.total_limit} products."
     )
 
     try:
+        from src.scrapers.factory import get_market_scraper
+
         logging.info(f"Initializing scraper for '{args.market}'...")
         scraper = get_market_scraper(
             market_name=market_key,
-            base_url=config["base_url"],
+            base_url=config.base_url,
             browser=args.browser,
             headless=not args.no_headless,
             per_page_limit=args.page_limit,
@@ -102,15 +131,27 @@ def main():
             )
             return
 
+        # Only needed once there is scraped data to process
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        from src.validators.data_validator import DataValidator
+        from src.reporting.analytics import generate_summary_analytics
+
         # --- Data Processing Step ---
         logging.info(f"Starting data processing for '{args.market}'...")
-        processor = get_data_processor(args.market)
-
-        all_processed_data = []
-        for raw_file_path in output_files:
-            processed_df = processor.process_market_data(raw_file_path)
-            if not processed_df.empty:
-                all_processed_data.append(processed_df)
+        # Files are independent and processing is CPU-bound, so spread them
+        # over worker processes when there is more than one.
+        if len(output_files) > 1:
+            max_workers = min(len(output_files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                processed_dfs = list(
+                    executor.map(process_raw_file, repeat(market_key), output_files)
+                )
+        else:
+            processed_dfs = [process_raw_file(market_key, output_files[0])]
+
+        all_processed_data = [df for df in processed_dfs if not df.empty]
 
         if not all_processed_data:
             logging.warning(
@@ -118,7 +159,13 @@ def main():
             )
             return
 
-        final_df = pd.concat(all_processed_data, ignore_index=True)
+        final_df = pd.concat(all_processed_data, ignore_index=True, copy=False)
+        # Each file's frame carries its own categories, so concat falls back to
+        # object columns; re-encode them so validation and analytics group on
+        # integer codes instead of hashing strings.
+        for column in ("category", "store_location"):
+            if column in final_df.columns:
+                final_df[column] = final_df[column].astype("category")
 
         # --- Data Validation Step ---
         logging.info("Starting data validation...")
@@ -133,20 +180,20 @@ def main():
 
         # --- Generate Analytics Report Step ---
         logging.info("Generating summary analytics report...")
-        analytics_report_path = os.path.join(
-            "outputs", "reports", f"{args.market.lower()}_summary_analytics_report.json"
-        )
-        generate_summary_analytics(validated_df, analytics_report_path)
+        generate_summary_analytics(validated_df, config.analytics_report_path)
 
         # --- Save Final Validated Data ---
-        output_dir = "outputs"
-        os.makedirs(output_dir, exist_ok=True)
-
-        output_csv_path = os.path.join(
-            output_dir, f"{args.market.lower()}_processed_data.csv"
+        # Relative to the project root, like the analytics report, so the
+        # script can be run from any working directory
+        output_csv_path = str(OUTPUT_DIR / f"{args.market.lower()}_processed_data.csv")
+
+        # pyarrow's CSV writer encodes whole columns in C++, avoiding the
+        # per-cell Python formatting of DataFrame.to_csv. Output is UTF-8, with
+        # every string quoted and whole floats written without ".0" (see the
+        # README's "Output files" section).
+        pacsv.write_csv(
+            pa.Table.from_pandas(validated_df, preserve_index=False), output_csv_path
         )
-
-        validated_df.to_csv(output_csv_path, index=False, encoding="utf-8")
         logging.info(
             f"Successfully processed and saved {len(validated_df)} validated records to {output_csv_path}"
         )
@@ -1,22 +1,23 @@
 import logging
-import sys
-from pathlib import Path
 import argparse
 
-# Add the project root to the Python path to allow importing project modules
-sys.path.insert(0, str(Path(__file__).parent.absolute()))
-
+from config.settings import ensure_output_dirs
 from dags.market_pipelines_dag import (
     scrape_data_task,
     process_data_task,
-    validate_data_task,
-    generate_analytics_report_task,
+    validate_and_report_task,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class MockTaskInstance:
     """A mock of the Google Cloud Composer (Airflow) TaskInstance object to simulate XComs for local testing."""
 
+    # XComs live in a plain dict in this process, so tasks may hand DataFrames
+    # to each other directly instead of re-reading them from disk.
+    in_memory_xcom = True
+
     def __init__(self):
         """Initializes the MockTaskInstance.
 
@@ -33,7 +34,9 @@ class MockTaskInstance:
             key (str): The key to store the value under.
             value (Any): The value to store.
         """
-        logging.info(f"[XCOM PUSH] key='{key}', value='{value}'")
+        # Lazy %-formatting: values may be whole DataFrames, whose repr is only
+        # worth building when debug logging is actually enabled.
+        logger.debug("[XCOM PUSH] key='%s', value='%s'", key, value)
         self.xcoms[key] = value
 
     def xcom_pull(self, key, task_ids):
@@ -46,7 +49,7 @@ class MockTaskInstance:
         Returns:
             Any: The value retrieved from the XComs dictionary.
         """
-        logging.info(f"[XCOM PULL] key='{key}', task_ids='{task_ids}'")
+        logger.debug("[XCOM PULL] key='%s', task_ids='%s'", key, task_ids)
         # In our new DAG, the key already contains the market name.
         return self.xcoms.get(key)
 
@@ -77,6 +80,9 @@ def run_pipeline_locally(
         level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
     )
 
+    # Ensure output directories exist before running
+    ensure_output_dirs()
+
     mock_ti = MockTaskInstance()
 
     # Define kwargs to pass to tasks, simulating the Airflow context
@@ -100,13 +106,11 @@ def run_pipeline_locally(
         logging.info(f"--- Starting local process task for '{market_name}' ---")
         process_data_task(market_name=market_name, **kwargs)
 
-        # --- 3. Validate Data ---
-        logging.info(f"--- Starting local validate task for '{market_name}' ---")
-        validate_data_task(market_name=market_name, **kwargs)
-
-        # --- 4. Generate Analytics ---
-        logging.info(f"--- Starting local analytics task for '{market_name}' ---")
-        generate_analytics_report_task(market_name=market_name, **kwargs)
+        # --- 3. Validate Data and Generate Analytics ---
+        logging.info(
+            f"--- Starting local validate and report task for '{market_name}' ---"
+        )
+        validate_and_report_task(market_name=market_name, **kwargs)
 
         logging.info(
             f"--- Local pipeline run for '{market_name}' finished successfully! ---"
@@ -145,9 +149,6 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
-    # Ensure output directories exist before running
-    Path("outputs/reports").mkdir(parents=True, exist_ok=True)
-
     run_pipeline_locally(
         market_name=args.market_name,
         headless=args.headless,
@@ -4,14 +4,32 @@ Main package for the supermarket price checker.
 This package contains the core functionality for scraping, processing, and validating
 supermarket data from various sources. It provides a modular architecture for adding
 new markets and data sources while maintaining consistency in data handling.
+
+The public names are imported lazily on first access (PEP 562), so importing one
+subpackage (e.g. `src.processors`) does not pull in Selenium via `src.scrapers`.
 """
 
-from .scrapers import get_market_scraper
-from .processors import get_data_processor
-from .validators import DataValidator
+import importlib
+
+# Maps each lazily imported public name to the subpackage that defines it
+_LAZY_IMPORTS = {
+    'get_market_scraper': '.scrapers',
+    'get_data_processor': '.processors',
+    'DataValidator': '.validators',
+}
 
 __all__ = [
     'get_market_scraper',
     'get_data_processor',
     'DataValidator'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Imports a public name from its subpackage the first time it is accessed."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache it so later lookups skip __getattr__
+    return value
@@ -4,16 +4,25 @@
 This file makes the processor classes and the factory function available
 for import from the `src.processors` package and defines the `__all__`
 variable to specify which names are part of the public API.
+
+The market-specific processor classes are imported lazily on first access
+(PEP 562), so a pipeline run only loads the processor it actually uses.
 """
 
+import importlib
+
 from .data_processor import DataProcessor
-from .vero_data_processor import VeroDataProcessor
-from .zito_data_processor import ZitoDataProcessor
-from .standard_market_data_processor import StandardMarketDataProcessor
-from .tinex_data_processor import TinexDataProcessor
-from .stokomak_data_processor import StokomakDataProcessor
 from .factory import get_data_processor
 
+# Maps each lazily imported processor class to the module that defines it
+_LAZY_IMPORTS = {
+    "VeroDataProcessor": ".vero_data_processor",
+    "ZitoDataProcessor": ".zito_data_processor",
+    "StandardMarketDataProcessor": ".standard_market_data_processor",
+    "TinexDataProcessor": ".tinex_data_processor",
+    "StokomakDataProcessor": ".stokomak_data_processor",
+}
+
 # This is a list of all the processors that are available in the module and can be imported
 __all__ = [
     "DataProcessor",
@@ -24,3 +33,13 @@ __all__ = [
     "StokomakDataProcessor",
     "get_data_processor",
 ]
+
+
+def __getattr__(name):
+    """Imports a processor class the first time it is accessed."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache it so later lookups skip __getattr__
+    return value
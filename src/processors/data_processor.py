@@ -6,12 +6,78 @@ common interface and shared functionality for processing product data from
 different markets. It includes methods for data standardization, price and
 unit calculations, and requires subclasses to implement market-specific logic.
 """
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional
 import re
+import codecs
 from abc import ABC, abstractmethod
 import os
 
+# Regexes used on every product row, compiled once at import time
+_PRICE_STRIP_RE = re.compile(r"[^\d.,]")
+# (matched case-sensitively against uppercased text)
+_PPU_DEN_PER_UNIT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*ДЕН\s*/\s*(\w+)")
+_PPU_FALLBACK_RES = (
+    re.compile(r"(\d+(?:\.\d+)?)\s*ДЕН"),
+    re.compile(r"(\d+(?:\.\d+)?)\s*ДЕНАР"),
+    re.compile(r"(\d+(?:\.\d+)?)\s*=\s*(\d+(?:\.\d+)?)"),
+)
+
+# Normalized availability strings, matched with O(1) set membership
+_AVAILABLE_INDICATORS = frozenset(
+    {"DA", "YES", "TRUE", "1", "AVAILABLE", "НА РАСПОЛАГАЊE", "ДА"}
+)
+_UNAVAILABLE_INDICATORS = frozenset(
+    {"NE", "NO", "FALSE", "0", "UNAVAILABLE", "НЕ", "НЕМА"}
+)
+
+
+class Measurement(NamedTuple):
+    """A quantity and unit parsed from a product field."""
+
+    quantity: Optional[float]
+    unit: Optional[str]
+    unit_type: Optional[str]
+    standard_quantity: Optional[float]
+
+
+_NO_MEASUREMENT = Measurement(None, None, None, None)
+
+# Fallback for items with no discernible unit (e.g., single piece)
+_SINGLE_PIECE = Measurement(1.0, "PIECE", "pieces", 1.0)
+
+
+def _text_values(series: pd.Series) -> pd.Series:
+    """Returns the series as object dtype so that `.str` yields NaN for non-strings."""
+    if series.dtype == object:
+        return series
+    return pd.Series(None, index=series.index, dtype=object)
+
+
+def _categories_from_descriptions(descriptions: pd.Series) -> pd.Series:
+    """Uses the stripped description as the category, "Uncategorized" if blank.
+
+    Each distinct description is stripped once and the result is broadcast
+    back to every row through the factorized codes.
+    """
+    codes, unique_descriptions = pd.factorize(_text_values(descriptions))
+    categories = pd.Series(unique_descriptions, dtype=object).str.strip()
+    categories = categories.mask(categories.eq("")).fillna("Uncategorized")
+    # Missing descriptions have code -1, which picks the trailing "Uncategorized"
+    categories = np.append(categories.to_numpy(), "Uncategorized")[codes]
+    return pd.Series(categories, index=descriptions.index, dtype=object)
+
+
+def _round_values(series: pd.Series, ndigits: int = 2) -> pd.Series:
+    """Rounds each value with the built-in `round`.
+
+    `Series.round` scales by 10**ndigits first and can round differently
+    (e.g. 1.205 -> 1.2 instead of 1.21).
+    """
+    return series.map(lambda value: round(value, ndigits), na_action="ignore")
+
+
 class DataProcessor(ABC):
     """Abstract base class for all data processors.
 
@@ -42,6 +108,24 @@ class DataProcessor(ABC):
         }
     )
 
+    # Raw fields that determine every output column except the store location
+    PRODUCT_KEY_COLUMNS = [
+        "product_name",
+        "current_price",
+        "regular_price",
+        "description",
+        "price_per_unit",
+    ]
+
+    # Output columns holding a small set of repeated strings, stored as categoricals
+    CATEGORICAL_COLUMNS = ("unit", "category", "store_location")
+
+    # Number of products parsed into a DataFrame at a time when stream-parsing
+    JSON_BATCH_SIZE = 10_000
+
+    # Shared encoding for the 'unit' column across all processors
+    UNIT_DTYPE = pd.CategoricalDtype(categories=list(UNIT_TYPE_MAP.values()))
+
     MEASUREMENT_PATTERNS = {  # This is a mapping of the measurement patterns to the standardized units
         "volume": {
             "units": ["МЛ", "Л", "ЛТ", "ЛИТАР", "ЛИТРИ", "ML", "L", "LT"],
@@ -113,6 +197,53 @@ class DataProcessor(ABC):
         },
     }
 
+    # unit_type -> {unit: factor} converting a quantity to the standard unit
+    # (liters, kilograms or pieces), built once when the class is defined.
+    # Volume and weight multipliers are in milliliters and grams, so their
+    # division by 1000 is folded into the factor.
+    STANDARD_FACTORS = {
+        measurement_type: {
+            unit: multiplier / 1000.0
+            if measurement_type in ("volume", "weight")
+            else float(multiplier)
+            for unit, multiplier in config["multipliers"].items()
+        }
+        for measurement_type, config in MEASUREMENT_PATTERNS.items()
+    }
+
+    # The measurement patterns compiled once per class: (unit_type, pattern, multipliers).
+    # All measurement patterns are matched case-sensitively against uppercased
+    # text, which avoids per-character case folding in the regex engine.
+    COMPILED_MEASUREMENT_PATTERNS = tuple(
+        (
+            measurement_type,
+            re.compile(config["pattern"]),
+            config["multipliers"],
+        )
+        for measurement_type, config in MEASUREMENT_PATTERNS.items()
+    )
+
+    # All measurement patterns fused into a single alternation, one named group
+    # per unit type wrapping that type's (quantity, unit) groups.
+    COMBINED_MEASUREMENT_PATTERN = re.compile(
+        "|".join(
+            f"(?P<{measurement_type}>{config['pattern']})"
+            for measurement_type, config in MEASUREMENT_PATTERNS.items()
+        )
+    )
+
+    # The same alternation anchored so that a single match honours the
+    # volume > weight > pieces priority, for column-wise extraction.
+    PRIORITIZED_MEASUREMENT_PATTERN = re.compile(
+        "^(?:"
+        + "|".join(
+            f".*?(?P<{measurement_type}>{config['pattern']})"
+            for measurement_type, config in MEASUREMENT_PATTERNS.items()
+        )
+        + ")",
+        re.DOTALL,
+    )
+
     # --- Public API ---
 
     def create_product_data(
@@ -149,25 +280,18 @@ class DataProcessor(ABC):
         current_price_val = self._extract_price(current_price)
         regular_price_val = self._extract_price(regular_price)
 
-        # Extract measurement data ONCE
-        name_data = self._extract_quantity_and_unit_from_product_name(product_name)
-        ppu_data = self._extract_quantity_and_unit_from_price_per_unit(
-            price_per_unit, current_price
-        )
-
         # --- Step 2: Establish a single source of truth for measurements ---
-        if name_data.get("unit_type"):
-            measurement_data = name_data
-        elif ppu_data.get("unit_type"):
-            measurement_data = ppu_data
-        else:
-            # Default fallback for items with no discernible unit (e.g., single piece)
-            measurement_data = {
-                "quantity": 1.0,
-                "unit": "PIECE",
-                "unit_type": "pieces",
-                "standard_quantity": 1.0,
-            }
+        # The name takes precedence, so the price-per-unit field is only parsed
+        # when the name has no measurement
+        measurement_data = self._extract_quantity_and_unit_from_product_name(
+            product_name
+        )
+        if not measurement_data.unit_type:
+            measurement_data = self._extract_quantity_and_unit_from_price_per_unit(
+                price_per_unit, current_price_val
+            )
+        if not measurement_data.unit_type:
+            measurement_data = _SINGLE_PIECE
 
         # --- Step 3: Perform calculations using the extracted data ---
 
@@ -185,14 +309,14 @@ class DataProcessor(ABC):
 
         # Calculate standardized price per unit
         price_per_unit_val = None
-        standard_quantity = measurement_data.get("standard_quantity")
+        standard_quantity = measurement_data.standard_quantity
         if current_price_val and standard_quantity and standard_quantity > 0:
             price_per_unit_val = round(current_price_val / standard_quantity, 2)
 
         # --- Step 4: Assemble the final, clean dictionary ---
 
         # Map the internal 'unit_type' to the desired final 'unit' name
-        unit_type = measurement_data.get("unit_type")
+        unit_type = measurement_data.unit_type
         unit_name = self.UNIT_TYPE_MAP.get(unit_type)
 
         result = {
@@ -207,16 +331,139 @@ class DataProcessor(ABC):
 
         return result
 
+    def create_product_frame(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """Creates standardized product data for a whole DataFrame at once.
+
+        This is the column-wise counterpart of `create_product_data`: every
+        cleanup and calculation is applied to entire columns instead of one
+        product at a time, producing the same values.
+
+        Args:
+            raw_df: A DataFrame with the raw 'product_name', 'current_price',
+                'regular_price', 'description', 'price_per_unit' and
+                'store_name' columns.
+
+        Returns:
+            A DataFrame with the columns defined by `FINAL_COLUMNS`, where the
+            `CATEGORICAL_COLUMNS` are pandas categoricals.
+        """
+        # Identical products (e.g. the same item listed at many branches) are
+        # cleaned once, then expanded back to every row
+        product_ids = (
+            raw_df.groupby(self.PRODUCT_KEY_COLUMNS, sort=False, dropna=False)
+            .ngroup()
+            .to_numpy()
+        )
+        first_rows = ~pd.Index(product_ids).duplicated()
+        cleaned = self._clean_products(raw_df[first_rows])
+
+        # Expand each column straight into the final schema, so the frame is
+        # built once instead of being reindexed and re-indexed afterwards
+        columns = {
+            column: cleaned[column].to_numpy()[product_ids]
+            for column in cleaned.columns
+        }
+        columns["store_location"] = self._create_store_locations(
+            raw_df["store_name"]
+        ).to_numpy()
+        for column in self.CATEGORICAL_COLUMNS:
+            columns[column] = pd.Categorical(
+                columns[column],
+                dtype=self.UNIT_DTYPE if column == "unit" else None,
+            )
+
+        return pd.DataFrame({column: columns[column] for column in self.FINAL_COLUMNS})
+
+    def _clean_products(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """Cleans the product fields of `create_product_frame` column-wise.
+
+        Args:
+            raw_df: The raw product rows, without duplicates.
+
+        Returns:
+            A DataFrame aligned with `raw_df` holding every column of
+            `FINAL_COLUMNS` except 'store_location'.
+        """
+        product_names = _text_values(raw_df["product_name"])
+        current_prices = self._extract_prices(raw_df["current_price"])
+        regular_prices = self._extract_prices(raw_df["regular_price"])
+        ppu_texts = _text_values(raw_df["price_per_unit"])
+
+        # Measurements from the name take precedence over the price-per-unit field
+        sanitized_names = product_names.str.replace(",", ".", regex=False).str.replace(
+            "/", " ", regex=False
+        )
+        measurements = self._extract_measurements(sanitized_names)
+
+        # Fall back to the price-per-unit field, unless it simply repeats the price
+        needs_ppu = measurements["unit_type"].isna() & ppu_texts.notna()
+        if needs_ppu.any():
+            ppu_candidates = ppu_texts[needs_ppu]
+            ppu_values = self._extract_price_per_unit_values(ppu_candidates)
+            candidate_prices = current_prices[needs_ppu]
+            repeats_price = (
+                candidate_prices.fillna(0).ne(0)
+                & ppu_values.fillna(0).ne(0)
+                & (candidate_prices - ppu_values).abs().lt(0.01)
+            )
+            ppu_measurements = self._extract_measurements(
+                ppu_candidates[~repeats_price]
+            )
+            measurements.loc[ppu_measurements.index] = ppu_measurements
+
+        # Default fallback for items with no discernible unit (e.g., single piece)
+        measurements = measurements.fillna(_SINGLE_PIECE._asdict())
+
+        has_discount = (
+            regular_prices.gt(0)
+            & current_prices.fillna(0).ne(0)
+            & current_prices.lt(regular_prices)
+        )
+        # The arithmetic is vectorized; only rows that get a value go through
+        # the per-value exact rounding
+        discounts = pd.Series(0.0, index=raw_df.index)
+        discounts[has_discount] = _round_values(
+            (
+                (regular_prices[has_discount] - current_prices[has_discount])
+                / regular_prices[has_discount]
+            )
+            * 100
+        )
+
+        standard_quantity = measurements["standard_quantity"]
+        has_unit_price = current_prices.fillna(0).ne(0) & standard_quantity.gt(0)
+        prices_per_unit = pd.Series(float("nan"), index=raw_df.index)
+        prices_per_unit[has_unit_price] = _round_values(
+            current_prices[has_unit_price] / standard_quantity[has_unit_price]
+        )
+
+        return pd.DataFrame(
+            {
+                "product_name": self._process_product_names(product_names),
+                "current_price": current_prices,
+                "price_per_unit": prices_per_unit,
+                "unit": measurements["unit_type"].map(self.UNIT_TYPE_MAP),
+                "category": self._get_categories(
+                    raw_df["description"], raw_df["product_name"]
+                ),
+                "discount_percentage": discounts,
+            },
+            index=raw_df.index,
+        )
+
     def generate_clean_csv(self, input_file: str, output_file: str):
         """Processes a raw data file and saves the result to a clean CSV.
 
         This method orchestrates the processing of an entire market data file by
         calling the market-specific `process_market_data` implementation and
-        then saving the resulting DataFrame to a specified CSV file.
+        then saving the resulting DataFrame to a specified CSV file. If the
+        output path ends in '.parquet', the data is saved as Parquet instead,
+        which is smaller and faster to read back for intermediate outputs.
 
         Args:
             input_file: The path to the input file containing raw data.
-            output_file: The path where the clean CSV will be saved.
+            output_file: The path where the clean CSV (or Parquet) file will
+                be saved.
         """
         self.logger.info(f"Starting processing for {input_file}...")
 
@@ -224,16 +471,25 @@ class DataProcessor(ABC):
         clean_df = self.process_market_data(input_file)
 
         # Save the final DataFrame
-        self.save_df_to_csv(clean_df, output_file)
+        if output_file.lower().endswith(".parquet"):
+            self.save_df_to_parquet(clean_df, output_file)
+        else:
+            self.save_df_to_csv(clean_df, output_file)
 
         self.logger.info(f"Processing complete. Clean data saved to {output_file}.")
 
     def save_df_to_csv(self, df: pd.DataFrame, file_path: str):
         """Saves a pandas DataFrame to a CSV file.
 
-        Ensures the output directory exists and saves the DataFrame using
-        'utf-8-sig' encoding to handle special characters correctly,
-        particularly for Excel compatibility.
+        Ensures the output directory exists and writes the DataFrame with
+        pyarrow's multithreaded CSV writer. A UTF-8 byte order mark is written
+        first ('utf-8-sig') so special characters display correctly,
+        particularly in Excel.
+
+        The format differs from `DataFrame.to_csv`: every string (including
+        the header) is quoted, whole floats are written without ".0" (65
+        rather than 65.0), and booleans as true/false. Missing values are
+        still empty fields.
 
         Args:
             df: The pandas DataFrame to save.
@@ -248,7 +504,37 @@ class DataProcessor(ABC):
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
 
-            df.to_csv(file_path, index=False, encoding="utf-8-sig")
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+
+            with open(file_path, "wb") as f:
+                f.write(codecs.BOM_UTF8)
+                pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f)
+            self.logger.info(f"Successfully saved {len(df)} records to {file_path}")
+        except Exception as e:
+            self.logger.error(f"Failed to save DataFrame to {file_path}: {e}")
+
+    def save_df_to_parquet(self, df: pd.DataFrame, file_path: str):
+        """Saves a pandas DataFrame to a Parquet file.
+
+        Ensures the output directory exists and saves the DataFrame with
+        snappy compression, like the pipeline's other intermediate files.
+        Column types, including categoricals, are preserved.
+
+        Args:
+            df: The pandas DataFrame to save.
+            file_path: The full path for the output Parquet file.
+        """
+        if df.empty:
+            self.logger.warning("DataFrame is empty. Nothing to save.")
+            return
+
+        try:
+            output_dir = os.path.dirname(file_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            df.to_parquet(file_path, compression="snappy", index=False)
             self.logger.info(f"Successfully saved {len(df)} records to {file_path}")
         except Exception as e:
             self.logger.error(f"Failed to save DataFrame to {file_path}: {e}")
@@ -325,17 +611,18 @@ class DataProcessor(ABC):
         Returns:
             The processed product name, or an empty string if input is invalid.
         """
-        if not product_name:
+        if not product_name or not isinstance(product_name, str):
             return ""
 
-        # To uppercase and strip whitespace
-        processed_name = re.sub(r"\s+", " ", product_name).strip().upper()
+        # To uppercase and collapse/strip whitespace; split() with no arguments
+        # already splits on runs of any Unicode whitespace
+        processed_name = " ".join(product_name.split()).upper()
 
         return processed_name
 
     def _extract_quantity_and_unit_from_product_name(
         self, product_name: str
-    ) -> Dict[str, Any]:
+    ) -> Measurement:
         """Parses a product name to find quantity and unit information.
 
         It searches the product name for patterns defined in `MEASUREMENT_PATTERNS`
@@ -346,42 +633,27 @@ class DataProcessor(ABC):
             product_name: The raw product name string.
 
         Returns:
-            A dictionary containing:
-                - 'quantity' (float): The detected numeric quantity.
-                - 'unit' (str): The detected unit string (e.g., 'Г', 'Л').
-                - 'unit_type' (str): The general category ('weight', 'volume').
-                - 'standard_quantity' (float): Quantity converted to a base
+            A `Measurement` containing:
+                - quantity (float): The detected numeric quantity.
+                - unit (str): The detected unit string (e.g., 'Г', 'Л').
+                - unit_type (str): The general category ('weight', 'volume').
+                - standard_quantity (float): Quantity converted to a base
                   unit (e.g., grams to kilograms, milliliters to liters).
-            Returns a dictionary with None values if no pattern is matched.
+            All fields are None if no pattern is matched.
         """
         if not product_name or not isinstance(product_name, str):
-            return {"quantity": None, "unit": None, "unit_type": None}
+            return _NO_MEASUREMENT
 
         # Create a sanitized version for parsing, leaving the original name untouched.
         # 1. Replace commas with periods for decimal conversion.
         # 2. Replace slashes with spaces to separate numbers (e.g., "1/1KG" -> "1 1KG").
         sanitized_name = product_name.replace(",", ".").replace("/", " ")
 
-        for measurement_type, config in self.MEASUREMENT_PATTERNS.items():
-            match = re.search(config["pattern"], sanitized_name, re.IGNORECASE)
-            if match:
-                quantity = float(match.group(1))
-                unit = match.group(2).upper()
-                standard_quantity = self._convert_to_standard(
-                    quantity, unit, measurement_type
-                )
-                return {
-                    "quantity": quantity,
-                    "unit": unit,
-                    "unit_type": measurement_type,
-                    "standard_quantity": standard_quantity,
-                }
-
-        return {"quantity": None, "unit": None, "unit_type": None}
+        return self._match_measurement(sanitized_name)
 
     def _extract_quantity_and_unit_from_price_per_unit(
-        self, price_per_unit: str, current_price: str
-    ) -> Dict[str, Any]:
+        self, price_per_unit: str, current_price_val: Optional[float]
+    ) -> Measurement:
         """Parses a 'price per unit' string to find quantity and unit.
 
         This function is similar to `_extract_quantity_and_unit_from_product_name`
@@ -391,41 +663,56 @@ class DataProcessor(ABC):
 
         Args:
             price_per_unit: The raw price-per-unit string (e.g., "150 ДЕН / КГ").
-            current_price: The main price of the product, used for comparison.
+            current_price_val: The already parsed main price of the product,
+                used for comparison.
 
         Returns:
-            A dictionary with 'quantity', 'unit', 'unit_type', and
-            'standard_quantity', or None values if no pattern is matched.
+            A `Measurement`, with all fields None if no pattern is matched.
         """
         if not price_per_unit or not isinstance(price_per_unit, str):
-            return {"quantity": None, "unit": None, "unit_type": None}
+            return _NO_MEASUREMENT
 
-        current_price_clean = self._extract_price(current_price)
         ppu_price = self._extract_price_per_unit_value(price_per_unit)
 
-        if (
-            current_price_clean
-            and ppu_price
-            and abs(current_price_clean - ppu_price) < 0.01
-        ):
-            return {"quantity": None, "unit": None, "unit_type": None}
+        if current_price_val and ppu_price and abs(current_price_val - ppu_price) < 0.01:
+            return _NO_MEASUREMENT
+
+        return self._match_measurement(price_per_unit)
+
+    def _match_measurement(self, text: str) -> Measurement:
+        """Finds the measurement in a string with a single combined regex scan.
+
+        Volume takes precedence over weight, and weight over pieces, with the
+        leftmost match of each type winning. The scan stops at the first volume
+        match; otherwise the first match of each remaining type is kept and the
+        highest-priority one is used.
+        The text is uppercased and matched case-sensitively.
+
+        Args:
+            text: The sanitized string to search.
 
-        for measurement_type, config in self.MEASUREMENT_PATTERNS.items():
-            match = re.search(config["pattern"], price_per_unit, re.IGNORECASE)
+        Returns:
+            A `Measurement`, with all fields None if no pattern is matched.
+        """
+        pattern = self.COMBINED_MEASUREMENT_PATTERN
+        first_matches: Dict[str, re.Match] = {}
+        for match in pattern.finditer(text.upper()):
+            first_matches.setdefault(match.lastgroup, match)
+            if match.lastgroup == "volume":
+                break
+
+        for measurement_type in self.MEASUREMENT_PATTERNS:
+            match = first_matches.get(measurement_type)
             if match:
-                quantity = float(match.group(1))
-                unit = match.group(2).upper()
+                group_index = pattern.groupindex[measurement_type]
+                quantity = float(match.group(group_index + 1))
+                unit = match.group(group_index + 2)
                 standard_quantity = self._convert_to_standard(
                     quantity, unit, measurement_type
                 )
-                return {
-                    "quantity": quantity,
-                    "unit": unit,
-                    "unit_type": measurement_type,
-                    "standard_quantity": standard_quantity,
-                }
+                return Measurement(quantity, unit, measurement_type, standard_quantity)
 
-        return {"quantity": None, "unit": None, "unit_type": None}
+        return _NO_MEASUREMENT
 
     def _extract_price(self, price_str: str) -> Optional[float]:
         """Extracts a float value from a string representing a price.
@@ -442,11 +729,10 @@ class DataProcessor(ABC):
         """
         if not price_str or not isinstance(price_str, str):
             return None
-        price_clean = re.sub(r"[^\d.,]", "", price_str)
-        if "," in price_clean and "." in price_clean:
-            price_clean = price_clean.replace(",", "")
-        elif "," in price_clean:
-            price_clean = price_clean.replace(",", ".")
+        price_clean = _PRICE_STRIP_RE.sub("", price_str)
+        # Commas are thousands separators next to a '.', otherwise decimal points
+        if "," in price_clean:
+            price_clean = price_clean.replace(",", "" if "." in price_clean else ".")
         try:
             return float(price_clean)
         except ValueError:
@@ -471,30 +757,23 @@ class DataProcessor(ABC):
         if not ppu_str or not isinstance(ppu_str, str):
             return None
 
-        for measurement_type, config in self.MEASUREMENT_PATTERNS.items():
-            match = re.search(
-                r"(\d+(?:\.\d+)?)\s*ДЕН\s*/\s*(\w+)", ppu_str.upper(), re.IGNORECASE
-            )
-            # match = re.search(config['pattern'], ppu_str.upper(), re.IGNORECASE)
+        ppu_upper = ppu_str.upper()
+        for measurement_type, _, multipliers in self.COMPILED_MEASUREMENT_PATTERNS:
+            match = _PPU_DEN_PER_UNIT_RE.search(ppu_upper)
             if match:
                 try:
                     price_value = float(match.group(1))
-                    unit = match.group(2).upper()
-                    if unit in config["multipliers"]:
-                        multiplier = config["multipliers"][unit]
+                    unit = match.group(2)
+                    if unit in multipliers:
+                        multiplier = multipliers[unit]
                         return price_value * multiplier / 1000.0
                     else:
                         return price_value
                 except ValueError:
                     continue
 
-        patterns = [
-            r"(\d+(?:\.\d+)?)\s*ДЕН",
-            r"(\d+(?:\.\d+)?)\s*ДЕНАР",
-            r"(\d+(?:\.\d+)?)\s*=\s*(\d+(?:\.\d+)?)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, ppu_str.upper(), re.IGNORECASE)
+        for pattern in _PPU_FALLBACK_RES:
+            match = pattern.search(ppu_upper)
             if match:
                 try:
                     return (
@@ -524,15 +803,7 @@ class DataProcessor(ABC):
         Returns:
             The quantity converted to the standard base unit as a float.
         """
-        multipliers = self.MEASUREMENT_PATTERNS[unit_type]["multipliers"]
-        if unit not in multipliers:
-            return quantity
-        base_quantity = quantity * multipliers[unit]
-        return (
-            base_quantity / 1000.0
-            if unit_type in ["volume", "weight"]
-            else base_quantity
-        )
+        return quantity * self.STANDARD_FACTORS.get(unit_type, {}).get(unit, 1.0)
 
     def _extract_availability(self, availability: str) -> Optional[bool]:
         """Converts a string representation of availability into a boolean.
@@ -550,18 +821,158 @@ class DataProcessor(ABC):
         if not availability or not isinstance(availability, str):
             return None
         availability_upper = availability.upper().strip()
-        available_indicators = [
-            "DA",
-            "YES",
-            "TRUE",
-            "1",
-            "AVAILABLE",
-            "НА РАСПОЛАГАЊE",
-            "ДА",
-        ]
-        unavailable_indicators = ["NE", "NO", "FALSE", "0", "UNAVAILABLE", "НЕ", "НЕМА"]
-        if availability_upper in available_indicators:
+        if availability_upper in _AVAILABLE_INDICATORS:
             return True
-        elif availability_upper in unavailable_indicators:
+        elif availability_upper in _UNAVAILABLE_INDICATORS:
             return False
         return None
+
+    # --- Column-wise Helper Methods ---
+
+    def _get_categories(
+        self, descriptions: pd.Series, product_names: pd.Series
+    ) -> pd.Series:
+        """Applies `_get_category` to whole columns.
+
+        Subclasses can override this with a vectorized implementation.
+
+        Args:
+            descriptions: The raw description column.
+            product_names: The raw product name column.
+
+        Returns:
+            A Series of category names aligned with the inputs.
+        """
+        return pd.Series(
+            [
+                self._get_category(description, product_name)
+                for description, product_name in zip(descriptions, product_names)
+            ],
+            index=descriptions.index,
+            dtype=object,
+        )
+
+    def _create_store_locations(self, store_names: pd.Series) -> pd.Series:
+        """Applies `_create_store_location` to a whole column.
+
+        Subclasses can override this with a vectorized implementation.
+
+        Args:
+            store_names: The raw store name column.
+
+        Returns:
+            A Series of store locations aligned with the input.
+        """
+        return pd.Series(
+            [self._create_store_location(store_name) for store_name in store_names],
+            index=store_names.index,
+            dtype=object,
+        )
+
+    def _process_product_names(self, product_names: pd.Series) -> pd.Series:
+        """Column-wise version of `_process_product_name`.
+
+        Args:
+            product_names: The raw product name column.
+
+        Returns:
+            The cleaned names, with an empty string for missing values.
+        """
+        return product_names.map(self._process_product_name)
+
+    def _extract_prices(self, prices: pd.Series) -> pd.Series:
+        """Column-wise version of `_extract_price`.
+
+        Args:
+            prices: The raw price column.
+
+        Returns:
+            A float Series, with NaN where the price could not be parsed.
+        """
+        # A single pass of the precompiled character filter per value is cheaper
+        # than chaining several Series.str passes over the column
+        return prices.map(self._extract_price).astype(float)
+
+    def _extract_availabilities(self, availabilities: pd.Series) -> pd.Series:
+        """Column-wise check for the values `_extract_availability` maps to True.
+
+        Args:
+            availabilities: The raw availability column.
+
+        Returns:
+            A boolean mask, True where the product is available. Unrecognized
+            and missing values are False.
+        """
+        normalized = _text_values(availabilities).str.upper().str.strip()
+        return normalized.isin(_AVAILABLE_INDICATORS)
+
+    def _extract_price_per_unit_values(self, ppu_texts: pd.Series) -> pd.Series:
+        """Column-wise version of `_extract_price_per_unit_value`.
+
+        Args:
+            ppu_texts: The price-per-unit column, as returned by `_text_values`.
+
+        Returns:
+            A float Series, with NaN where no value could be parsed.
+        """
+        ppu_upper = ppu_texts.str.upper()
+
+        per_unit = ppu_upper.str.extract(_PPU_DEN_PER_UNIT_RE)
+        price_values = per_unit[0].astype(float)
+        multipliers = per_unit[1].map(
+            self.MEASUREMENT_PATTERNS["volume"]["multipliers"]
+        )
+        values = (price_values * multipliers / 1000.0).where(
+            multipliers.notna(), price_values
+        )
+
+        # The value of each fallback pattern is its last group
+        for pattern in _PPU_FALLBACK_RES:
+            missing = values.isna() & ppu_upper.notna()
+            if not missing.any():
+                break
+            values[missing] = (
+                ppu_upper[missing].str.extract(pattern).iloc[:, -1].astype(float)
+            )
+        return values
+
+    def _extract_measurements(self, texts: pd.Series) -> pd.DataFrame:
+        """Column-wise version of `_match_measurement`.
+
+        Args:
+            texts: The (sanitized) strings to search.
+
+        Returns:
+            A DataFrame with 'quantity', 'unit', 'unit_type' and
+            'standard_quantity' columns, all NaN where nothing matched.
+        """
+        pattern = self.PRIORITIZED_MEASUREMENT_PATTERN
+        matches = texts.str.upper().str.extract(pattern)
+        measurements = pd.DataFrame(
+            {
+                "quantity": pd.Series(float("nan"), index=texts.index),
+                "unit": pd.Series(None, index=texts.index, dtype=object),
+                "unit_type": pd.Series(None, index=texts.index, dtype=object),
+                "standard_quantity": pd.Series(float("nan"), index=texts.index),
+            }
+        )
+
+        for measurement_type in self.MEASUREMENT_PATTERNS:
+            group_index = pattern.groupindex[measurement_type]
+            type_matches = matches[matches[measurement_type].notna()]
+            if type_matches.empty:
+                continue
+            quantity = type_matches.iloc[:, group_index].astype(float)
+            unit = type_matches.iloc[:, group_index + 1]
+            factors = unit.map(self.STANDARD_FACTORS[measurement_type])
+            measurements.loc[type_matches.index] = pd.DataFrame(
+                {
+                    "quantity": quantity,
+                    "unit": unit,
+                    "unit_type": measurement_type,
+                    "standard_quantity": (quantity * factors).where(
+                        factors.notna(), quantity
+                    ),
+                }
+            )
+        return measurements
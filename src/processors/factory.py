@@ -1,19 +1,23 @@
 # -*- coding: utf-8 -*-
-from typing import Type, Dict
+import importlib
+from typing import Dict
 from .data_processor import DataProcessor
-from .vero_data_processor import VeroDataProcessor
-from .zito_data_processor import ZitoDataProcessor
-from .tinex_data_processor import TinexDataProcessor
-from .stokomak_data_processor import StokomakDataProcessor
-
-# Mapping of market names to their corresponding data processor classes
-PROCESSOR_MAP: Dict[str, Type[DataProcessor]] = {
-    "vero": VeroDataProcessor,
-    "zito": ZitoDataProcessor,
-    "tinex": TinexDataProcessor,
-    "stokomak": StokomakDataProcessor,
+
+# Mapping of market names to the names of their data processor classes. The
+# classes are resolved through the package, which imports them on first use.
+PROCESSOR_MAP: Dict[str, str] = {
+    "vero": "VeroDataProcessor",
+    "zito": "ZitoDataProcessor",
+    "tinex": "TinexDataProcessor",
+    "stokomak": "StokomakDataProcessor",
 }
 
+# Processor instances created so far, keyed by lowercased market name. A
+# plain dict rather than functools.lru_cache: the cache has to be keyed by the
+# lowercased name while the error for an unknown market quotes the name as
+# passed, and failed lookups must not be cached.
+_INSTANCES: Dict[str, DataProcessor] = {}
+
 
 def get_data_processor(market_name: str) -> DataProcessor:
     """
@@ -22,7 +26,9 @@ def get_data_processor(market_name: str) -> DataProcessor:
     This function provides a centralized way to instantiate the appropriate
     data processor based on the market name. It supports all configured
     markets and returns a properly initialized processor instance ready
-    for data processing operations.
+    for data processing operations. Processors are stateless between calls,
+    so the instance is memoized per lowercased market name and repeated
+    lookups for the same market (in any casing) return the same object.
 
     Args:
         market_name: The name of the market (e.g., 'vero', 'zito', 'tinex', 'stokomak').
@@ -42,11 +48,17 @@ def get_data_processor(market_name: str) -> DataProcessor:
         True
     """
     market_name_lower = market_name.lower()
-    processor_class = PROCESSOR_MAP.get(market_name_lower)
+    processor = _INSTANCES.get(market_name_lower)
+    if processor is not None:
+        return processor
 
-    if processor_class:
-        return processor_class()
-    else:
+    processor_class_name = PROCESSOR_MAP.get(market_name_lower)
+    if processor_class_name is None:
         raise ValueError(
             f"Unsupported market: '{market_name}'. No data processor found."
         )
+
+    package = importlib.import_module(__package__)
+    processor = getattr(package, processor_class_name)()
+    _INSTANCES[market_name_lower] = processor
+    return processor
@@ -9,10 +9,15 @@ implements the category and store location logic suitable for these sites.
 import pandas as pd
 from typing import Optional
 import logging
-import json
+import ijson
+import itertools
 import os
 
-from .data_processor import DataProcessor
+from .data_processor import (
+    DataProcessor,
+    _categories_from_descriptions,
+    _text_values,
+)
 
 
 class StandardMarketDataProcessor(DataProcessor):
@@ -24,6 +29,17 @@ class StandardMarketDataProcessor(DataProcessor):
     markets, the category is taken directly from the 'description' field.
     """
 
+    # Raw JSON keys mapped to the column names used by `create_product_frame`
+    RAW_COLUMN_MAP = {
+        "назив_на_стока-производ": "product_name",
+        "продажна_цена": "current_price",
+        "редовна_цена": "regular_price",
+        "опис_на_стока": "description",
+        "единечна_цена": "price_per_unit",
+        "достапност_во_продажен_објект": "availability",
+        "market_name": "store_name",
+    }
+
     def __init__(self):
         """Initializes the StandardMarketDataProcessor."""
         self.logger = logging.getLogger(__name__)
@@ -32,10 +48,10 @@ class StandardMarketDataProcessor(DataProcessor):
     def process_market_data(self, file_path: str) -> pd.DataFrame:
         """Loads data from a JSON file and processes it into a DataFrame.
 
-        This method reads a list of product dictionaries from the specified
-        JSON file, processes each one into a standardized format using the
-        `create_product_data` method from the base class, and compiles
-        them into a single pandas DataFrame.
+        This method stream-parses the list of product dictionaries in the
+        specified JSON file in batches, builds a DataFrame with standard
+        column names, and cleans all products column-wise using the
+        `create_product_frame` method from the base class.
 
         Args:
             file_path: The path to the input JSON file.
@@ -45,33 +61,32 @@ class StandardMarketDataProcessor(DataProcessor):
             product data, ready for validation and analysis. Returns an
             empty DataFrame if the file is not found or is empty.
         """
+        # Stream the products in batches and let pandas build the columns of
+        # each batch, so the full list of raw dictionaries is never in memory
+        raw_keys = list(self.RAW_COLUMN_MAP)
+        batches = []
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            with open(file_path, "rb") as f:
+                items = ijson.items(f, "item", use_float=True)
+                while True:
+                    batch = list(itertools.islice(items, self.JSON_BATCH_SIZE))
+                    if not batch:
+                        break
+                    batches.append(pd.DataFrame.from_records(batch, columns=raw_keys))
+        except (FileNotFoundError, ijson.JSONError) as e:
             self.logger.error(
                 f"Could not read or parse the data file at {file_path}: {e}"
             )
             return pd.DataFrame()
 
-        if not raw_data:
+        if not batches:
             self.logger.warning(f"No data found in {file_path}.")
             return pd.DataFrame()
 
-        clean_data = []
-        for item in raw_data:
-            processed_item = self.create_product_data(
-                product_name=item.get("назив_на_стока-производ"),
-                current_price=item.get("продажна_цена"),
-                regular_price=item.get("редовна_цена"),
-                description=item.get("опис_на_стока"),
-                price_per_unit=item.get("единечна_цена"),
-                availability=item.get("достапност_во_продажен_објект"),
-                store_name=item.get("market_name"),
-            )
-            clean_data.append(processed_item)
-
-        return pd.DataFrame(clean_data)
+        raw_df = pd.concat(batches, ignore_index=True).rename(
+            columns=self.RAW_COLUMN_MAP
+        )
+        return self.create_product_frame(raw_df)
 
     def _get_category(self, description: str, product_name: str) -> Optional[str]:
         """Extracts the category from the product's description.
@@ -92,8 +107,10 @@ class StandardMarketDataProcessor(DataProcessor):
         if description and isinstance(description, str) and description.strip():
             return description.strip()
 
+        # Called per product, so the message is only formatted if DEBUG is enabled
         self.logger.debug(
-            f"No category found for product '{product_name}'. Defaulting to Uncategorized."
+            "No category found for product '%s'. Defaulting to Uncategorized.",
+            product_name,
         )
         return "Uncategorized"
 
@@ -111,3 +128,31 @@ class StandardMarketDataProcessor(DataProcessor):
             The cleaned store name to be used as the location.
         """
         return store_name.strip() if store_name else "Unknown Location"
+
+    def _get_categories(
+        self, descriptions: pd.Series, product_names: pd.Series
+    ) -> pd.Series:
+        """Column-wise version of `_get_category`.
+
+        Args:
+            descriptions: The raw description column.
+            product_names: The raw product name column (unused).
+
+        Returns:
+            The stripped descriptions, with "Uncategorized" where missing.
+        """
+        return _categories_from_descriptions(descriptions)
+
+    def _create_store_locations(self, store_names: pd.Series) -> pd.Series:
+        """Column-wise version of `_create_store_location`.
+
+        Args:
+            store_names: The raw store name column.
+
+        Returns:
+            The cleaned store names, with "Unknown Location" for missing values.
+        """
+        store_names = _text_values(store_names)
+        return (
+            store_names.mask(store_names.eq("")).str.strip().fillna("Unknown Location")
+        )
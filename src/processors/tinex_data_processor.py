@@ -1,6 +1,43 @@
 # -*- coding: utf-8 -*-
+from .data_processor import _text_values
 from .standard_market_data_processor import StandardMarketDataProcessor
 from typing import Optional
+import re
+import numpy as np
+import pandas as pd
+
+# Category keywords matched against uppercased product names, checked in order.
+# Can be extended with more keywords.
+_CATEGORY_KEYWORDS = (
+    (
+        "Млечни производи",
+        ("ЈОГУРТ", "МЛЕКО", "СИРЕЊЕ", "КАШКАВАЛ", "ЗДЕНКА", "ПАВЛАКА", "КАЈМАК"),
+    ),
+    ("Леб и пецива", ("ЛЕБ", "ПЕЦИВО", "БАГЕТ", "КРОАСАН", "PIJALOK")),
+    (
+        "Пијалоци",
+        (
+            "ПИВО",
+            "ВИНО",
+            "СОК",
+            "ВОДА",
+            "ПИЈАЛОК",
+            "ВИСКИ",
+            "КОЊАК",
+            "ВОДКА",
+            "ЛИКЕР",
+            "РАКИЈА",
+            "РУМ",
+            "ЏИН",
+        ),
+    ),
+)
+
+# One compiled alternation per category, so each is a single regex scan
+_CATEGORY_PATTERNS = tuple(
+    (re.compile("|".join(map(re.escape, keywords))), category)
+    for category, keywords in _CATEGORY_KEYWORDS
+)
 
 
 class TinexDataProcessor(StandardMarketDataProcessor):
@@ -17,44 +54,41 @@ class TinexDataProcessor(StandardMarketDataProcessor):
         For standard markets, we assume the category can be inferred from the product name.
         This is a placeholder and may need more specific logic.
         """
-        # can be extended with more keywords
         name_upper = product_name.upper()
-        if any(
-            keyword in name_upper
-            for keyword in [
-                "ЈОГУРТ",
-                "МЛЕКО",
-                "СИРЕЊЕ",
-                "КАШКАВАЛ",
-                "ЗДЕНКА",
-                "ПАВЛАКА",
-                "КАЈМАК",
-            ]
-        ):
-            return "Млечни производи"
-        if any(
-            keyword in name_upper
-            for keyword in ["ЛЕБ", "ПЕЦИВО", "БАГЕТ", "КРОАСАН", "PIJALOK"]
-        ):
-            return "Леб и пецива"
-        if any(
-            keyword in name_upper
-            for keyword in [
-                "ПИВО",
-                "ВИНО",
-                "СОК",
-                "ВОДА",
-                "ПИЈАЛОК",
-                "ВИСКИ",
-                "КОЊАК",
-                "ВОДКА",
-                "ЛИКЕР",
-                "РАКИЈА",
-                "РУМ",
-                "ЏИН",
-            ]
-        ):
-            return "Пијалоци"
+        for pattern, category in _CATEGORY_PATTERNS:
+            if pattern.search(name_upper):
+                return category
 
         # Fallback
         return "Uncategorized"
+
+    def _get_categories(
+        self, descriptions: pd.Series, product_names: pd.Series
+    ) -> pd.Series:
+        """Column-wise version of `_get_category`.
+
+        Each category's keyword pattern is matched once over the distinct
+        uppercased names; the first matching category wins, and the result is
+        broadcast back to every row through the factorized codes.
+
+        Args:
+            descriptions: The raw description column (unused).
+            product_names: The raw product name column.
+
+        Returns:
+            A Series of category names aligned with the inputs.
+        """
+        codes, unique_names = pd.factorize(_text_values(product_names))
+        names_upper = pd.Series(unique_names, dtype=object).str.upper()
+        matches = [
+            names_upper.str.contains(pattern, na=False)
+            for pattern, _ in _CATEGORY_PATTERNS
+        ]
+        unique_categories = np.select(
+            matches,
+            [category for _, category in _CATEGORY_PATTERNS],
+            default="Uncategorized",
+        )
+        # Missing names have code -1, which picks the trailing "Uncategorized"
+        categories = np.append(unique_categories, "Uncategorized")[codes]
+        return pd.Series(categories, index=product_names.index, dtype=object)
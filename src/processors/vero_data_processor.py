@@ -1,32 +1,60 @@
 # -*- coding: utf-8 -*-
-from .data_processor import DataProcessor
+from .data_processor import (
+    DataProcessor,
+    _categories_from_descriptions,
+    _text_values,
+)
 import pandas as pd
 import os
-import json
-from typing import Dict, Optional
+import ijson
+import itertools
+import orjson
+from typing import Any, Dict, List, Optional
 import logging
 
+from config.settings import OUTPUT_DIR
+
 
 class VeroDataProcessor(DataProcessor):
     """Concrete data processor for Vero market data."""
 
+    # Raw key holding the product's in-store availability
+    AVAILABILITY_KEY = "достапност_во\nпродажен_објект"
+
+    # Raw JSON keys mapped to the column names used by `create_product_frame`
+    RAW_COLUMN_MAP = {
+        "назив_на_стока": "product_name",
+        "продажна_цена\n(со_ддв)": "current_price",
+        "редовна_цена\n(со_ддв)": "regular_price",
+        "опис_на_стока": "description",
+        "единечна_цена": "price_per_unit",
+        AVAILABILITY_KEY: "availability",
+        "market_code": "store_name",  # Use market_code from scraper
+    }
+
+    # Raw files larger than this are stream-parsed instead of loaded at once
+    STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024
+
     def __init__(self):
         super().__init__()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.market_map = self._load_market_map()
+        # Series form of the map, so column-wise lookups skip pandas'
+        # dict-to-Series conversion on every call
+        self._market_map_series = pd.Series(self.market_map, dtype=object)
 
     def _load_market_map(self) -> Dict[str, str]:
         """Loads the market code-to-name mapping file created by the scraper."""
-        map_path = "outputs/vero_market_map.json"
+        map_path = os.path.join(OUTPUT_DIR, "vero_market_map.json")
         if not os.path.exists(map_path):
             self.logger.warning(
                 f"Market map file not found at {map_path}. Store names will be codes."
             )
             return {}
         try:
-            with open(map_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            with open(map_path, "rb") as f:
+                return orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError) as e:
             self.logger.error(f"Failed to load or parse market map at {map_path}: {e}")
             return {}
 
@@ -48,8 +76,10 @@ class VeroDataProcessor(DataProcessor):
         if description and isinstance(description, str) and description.strip():
             return description.strip()
         else:
+            # Called per product, so the message is only formatted if DEBUG is enabled
             self.logger.debug(
-                f"No category found for product '{product_name}'. Defaulting to Uncategorized."
+                "No category found for product '%s'. Defaulting to Uncategorized.",
+                product_name,
             )
             return "Uncategorized"
 
@@ -66,6 +96,76 @@ class VeroDataProcessor(DataProcessor):
             market_code, store_name
         )  # Fallback to the original store_name
 
+    def _get_categories(
+        self, descriptions: pd.Series, product_names: pd.Series
+    ) -> pd.Series:
+        """Column-wise version of `_get_category`.
+
+        Args:
+            descriptions: The raw description column.
+            product_names: The raw product name column (unused).
+
+        Returns:
+            The stripped descriptions, with "Uncategorized" where missing.
+        """
+        return _categories_from_descriptions(descriptions)
+
+    def _create_store_locations(self, store_names: pd.Series) -> pd.Series:
+        """Column-wise version of `_create_store_location`.
+
+        Args:
+            store_names: The raw store name column (e.g., '89_1').
+
+        Returns:
+            The full market names, falling back to the store name when the
+            code is not in the map and to "Unknown Store" when it is missing.
+        """
+        store_names = _text_values(store_names)
+        market_codes = store_names.str.split("_", n=1).str[0]
+        locations = market_codes.map(self._market_map_series).fillna(store_names)
+        return locations.mask(store_names.isna() | store_names.eq(""), "Unknown Store")
+
+    def _load_available_products(self, file_path: str) -> pd.DataFrame:
+        """Loads the raw products from a JSON file, keeping only available ones.
+
+        Files larger than `STREAMING_THRESHOLD_BYTES` are stream-parsed with
+        ijson and filtered in batches of `JSON_BATCH_SIZE` as they are read, so
+        unavailable products are never all held in memory at once. Smaller
+        files are parsed in one go with orjson and filtered as a single batch.
+
+        Args:
+            file_path: The path to the raw Vero JSON file.
+
+        Returns:
+            The available products, with columns renamed per `RAW_COLUMN_MAP`.
+        """
+        with open(file_path, "rb") as f:
+            if os.path.getsize(file_path) > self.STREAMING_THRESHOLD_BYTES:
+                items = ijson.items(f, "item", use_float=True)
+                batches = iter(
+                    lambda: list(itertools.islice(items, self.JSON_BATCH_SIZE)), []
+                )
+            else:
+                batches = [orjson.loads(f.read())]
+            frames = [self._available_products(batch) for batch in batches]
+        if not frames:
+            return pd.DataFrame(columns=list(self.RAW_COLUMN_MAP.values()))
+        return pd.concat(frames, ignore_index=True)
+
+    def _available_products(self, products: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Builds a DataFrame of the available products in a batch.
+
+        Args:
+            products: The raw product dictionaries.
+
+        Returns:
+            The available products, with columns renamed per `RAW_COLUMN_MAP`.
+        """
+        raw_df = pd.DataFrame.from_records(
+            products, columns=list(self.RAW_COLUMN_MAP)
+        ).rename(columns=self.RAW_COLUMN_MAP)
+        return raw_df.loc[self._extract_availabilities(raw_df["availability"])]
+
     def process_market_data(self, file_path: str) -> pd.DataFrame:
         """
         Loads raw Vero data from a JSON file, processes it, filters for available items,
@@ -73,43 +173,18 @@ class VeroDataProcessor(DataProcessor):
         """
         self.logger.info(f"Processing Vero data from: {file_path}")
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            raw_df = self._load_available_products(file_path)
+        except (FileNotFoundError, orjson.JSONDecodeError, ijson.JSONError) as e:
             self.logger.error(f"Could not read or parse the file at {file_path}: {e}")
             return pd.DataFrame()
 
-        processed_products = []
-        for product in raw_data:
-            # Check availability first to skip unavailable products
-            is_available = self._extract_availability(
-                product.get("достапност_во\nпродажен_објект", "")
-            )
-            if not is_available:
-                continue
-
-            # Process the available product
-            clean_product_data = self.create_product_data(
-                product_name=product.get("назив_на_стока"),
-                current_price=product.get("продажна_цена\n(со_ддв)"),
-                regular_price=product.get("редовна_цена\n(со_ддв)"),
-                description=product.get("опис_на_стока"),
-                price_per_unit=product.get("единечна_цена"),
-                availability=product.get("достапност_во\nпродажен_објект"),
-                store_name=product.get("market_code"),  # Use market_code from scraper
-            )
-            processed_products.append(clean_product_data)
-
-        if not processed_products:
+        if raw_df.empty:
             self.logger.warning("No available products found to process.")
             return pd.DataFrame()
 
-        # Create DataFrame from the list of dictionaries
-        df = pd.DataFrame(processed_products)
-
-        # Ensure the DataFrame has exactly the columns required, in the correct order
-        # This will drop any extra columns and add any missing ones (with NaN)
-        final_df = df.reindex(columns=self.FINAL_COLUMNS)
+        # Clean the raw columns column-wise; this also orders the columns as
+        # in FINAL_COLUMNS
+        final_df = self.create_product_frame(raw_df)
 
         self.logger.info(
             f"Successfully processed {len(final_df)} available products from {file_path}."
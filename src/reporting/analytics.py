@@ -6,11 +6,50 @@ supermarket data, such as price distributions and discount information,
 and saves the results as a JSON report.
 """
 import logging
-import json
+from typing import Any, Dict, List
 import os
+import numpy as np
+import orjson
 import pandas as pd
 
 
+def _top_priced_products(
+    df: pd.DataFrame, n: int, most_expensive: bool
+) -> List[Dict[str, Any]]:
+    """Selects the `n` most or least expensive products, ordered by price.
+
+    Uses `np.partition` to find the price cut-off in linear time and only
+    sorts the products within it, instead of sorting the whole DataFrame.
+    Products with equal prices keep their row order, including at the
+    cut-off.
+
+    Args:
+        df: The DataFrame with 'product_name' and 'current_price' columns.
+        n: The number of products to select.
+        most_expensive: If True, selects the most expensive products in
+            descending order; otherwise the cheapest in ascending order.
+
+    Returns:
+        A list of {'product_name', 'current_price'} records. Products
+        without a price (NaN) are skipped, so fewer than `n` records are
+        returned when fewer products have a price.
+    """
+    prices = df["current_price"].to_numpy(dtype=float)
+    priced_rows = np.flatnonzero(~np.isnan(prices))
+    keys = -prices[priced_rows] if most_expensive else prices[priced_rows]
+    if len(keys) > n:
+        cutoff = np.partition(keys, n - 1)[n - 1]
+        within = np.flatnonzero(keys < cutoff)
+        tied = np.flatnonzero(keys == cutoff)[: n - len(within)]
+        candidates = np.concatenate([within, tied])
+    else:
+        candidates = np.arange(len(keys))
+    candidates = candidates[np.argsort(keys[candidates], kind="stable")]
+    return df.iloc[priced_rows[candidates]][
+        ["product_name", "current_price"]
+    ].to_dict("records")
+
+
 def generate_summary_analytics(df: pd.DataFrame, output_path: str):
     """
     Generates a summary analytics report from the validated DataFrame
@@ -38,17 +77,23 @@ def generate_summary_analytics(df: pd.DataFrame, output_path: str):
 
     try:
         # Basic stats
-        total_products = int(df.shape[0])
-        products_on_discount = int(df[df["discount_percentage"] > 0].shape[0])
+        total_products = len(df)
+        # Count on the raw array rather than materializing a filtered copy
+        discounts = df["discount_percentage"].to_numpy(dtype=float)
+        products_on_discount = int(np.count_nonzero(discounts > 0))
 
         # Per-category analytics
         category_analytics = {}
         if "category" in df.columns and not df["category"].isnull().all():
-            category_group = df.groupby("category")
+            # One groupby pass computes both aggregates; observed=True skips
+            # categories of a categorical column that have no rows
+            category_stats = df.groupby("category", observed=True).agg(
+                count=("current_price", "size"),
+                average_price=("current_price", "mean"),
+            )
             category_analytics = {
-                "products_per_category": category_group.size().to_dict(),
-                "average_price_per_category": category_group["current_price"]
-                .mean()
+                "products_per_category": category_stats["count"].to_dict(),
+                "average_price_per_category": category_stats["average_price"]
                 .round(2)
                 .to_dict(),
             }
@@ -56,17 +101,8 @@ def generate_summary_analytics(df: pd.DataFrame, output_path: str):
             logger.warning("No category data available for analytics.")
 
         # Top 10 products
-        df_sorted_price = df.sort_values(by="current_price", ascending=False)
-        top_10_expensive = df_sorted_price.head(10)[
-            ["product_name", "current_price"]
-        ].to_dict("records")
-        top_10_cheapest = (
-            df_sorted_price.tail(10)
-            .sort_values(by="current_price", ascending=True)[
-                ["product_name", "current_price"]
-            ]
-            .to_dict("records")
-        )
+        top_10_expensive = _top_priced_products(df, 10, most_expensive=True)
+        top_10_cheapest = _top_priced_products(df, 10, most_expensive=False)
 
         report = {
             "report_generated_at": pd.Timestamp.now().isoformat(),
@@ -84,8 +120,14 @@ def generate_summary_analytics(df: pd.DataFrame, output_path: str):
 
         # Save the report
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=4)
+        payload = orjson.dumps(
+            report,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        )
+        with open(output_path, "wb") as f:
+            f.write(payload)
 
         logger.info(
             f"Successfully generated and saved analytics report to {output_path}"
@@ -1,22 +1,152 @@
 # -*- coding: utf-8 -*-
+import contextlib
+import email.utils
 import time
 import os
-import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set
 from abc import ABC
 import re
 
+import orjson
+import requests
+from lxml import etree, html
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from config.settings import OUTPUT_DIR
+from src.utils.helpers import RateLimiter, handle_selenium_error
+
+# Page texts marking the end of a market's listing and an empty product table
+_END_OF_MARKET_TEXT = "Нема артикли по зададените критериуми"
+_NO_DATA_TEXT = "Нема податоци за прикажување"
+
+# Responses from an overloaded server, retried after a backoff
+_RETRY_STATUS_CODES = frozenset({429, 503})
+
+# XPath equivalent of the "div.table-responsive .table" CSS selector
+_PRODUCT_TABLE_XPATH = (
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' table-responsive ')]"
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' table ')]"
+)
+
+# Checks the page's rendered text for a message, so only a boolean crosses the
+# WebDriver connection instead of the whole page source
+_PAGE_CONTAINS_TEXT_SCRIPT = (
+    "return document.body !== null && document.body.innerText.includes(arguments[0]);"
+)
+
+# Reads the header and cell texts of the product table in a single WebDriver
+# call, instead of one round trip per row and per cell. innerText matches the
+# rendered text Selenium's `.text` returns.
+_TABLE_CONTENTS_SCRIPT = """
+const table = document.querySelector("div.table-responsive .table");
+if (!table) {
+    return null;
+}
+const texts = (root, selector) =>
+    Array.from(root.querySelectorAll(selector), (element) => element.innerText);
+return {
+    headers: texts(table, "thead th"),
+    rows: Array.from(table.querySelectorAll("tbody tr"), (row) => texts(row, "td")),
+};
+"""
+
+# Stand in for line breaks while whitespace is collapsed in `_element_text`:
+# a `<br>` tag, the edge of a block element and the edge of a paragraph
+_LINE_BREAK = "\x00"
+_BLOCK_BREAK = "\x01"
+_PARAGRAPH_BREAK = "\x02"
+
+# Elements whose content innerText puts on lines of its own
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "caption", "dd", "details",
+        "dialog", "div", "dl", "dt", "fieldset", "figcaption", "figure",
+        "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+        "li", "main", "nav", "ol", "pre", "section", "summary", "table", "tr",
+        "ul",
+    }
+)
+
+# The whitespace that HTML rendering collapses; unlike `str.split`, it leaves
+# non-breaking spaces alone, as innerText does
+_COLLAPSIBLE_WHITESPACE_RE = re.compile(r"[ \t\n\r\f]+")
+
+# A run of block and paragraph edges, with the whitespace around them
+_BLOCK_BREAKS_RE = re.compile(
+    f" ?[{_BLOCK_BREAK}{_PARAGRAPH_BREAK}][ {_BLOCK_BREAK}{_PARAGRAPH_BREAK}]* ?"
+)
+
+
+def _iter_element_text(element: html.HtmlElement) -> Iterator[str]:
+    """Yields the text pieces of an element in document order.
+
+    Comments and processing instructions are skipped. `<br>` tags are
+    yielded as `_LINE_BREAK`, and the start and end of block elements as
+    `_BLOCK_BREAK` (`_PARAGRAPH_BREAK` for `<p>`).
+    """
+    if element.tag == "br":
+        yield _LINE_BREAK
+    if element.tag == "p":
+        edge = _PARAGRAPH_BREAK
+    elif element.tag in _BLOCK_TAGS:
+        edge = _BLOCK_BREAK
+    else:
+        edge = ""
+    yield edge
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str):
+            yield from _iter_element_text(child)
+        if child.tail:
+            yield child.tail
+    yield edge
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Returns how long a response's Retry-After header asks to wait.
+
+    The header holds either a number of seconds or an HTTP date.
+
+    Args:
+        response: A 429 or 503 response.
+
+    Returns:
+        The seconds to wait, or None if the header is missing or invalid.
+    """
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
 
-from src.utils.helpers import handle_selenium_error, random_delay
+
+def _header_key(header_text: str) -> str:
+    """Converts a table header's text into the key used for product fields."""
+    return header_text.strip().lower().replace(" ", "_").replace("\n", "_")
 
 
 class BaseMarketScraper(ABC):
@@ -33,10 +163,70 @@ class BaseMarketScraper(ABC):
     2. For each location, scrape products page by page.
     3. Stop when a page with no products is detected.
 
+    Listing pages are fetched over plain HTTP and parsed with lxml; the
+    Selenium WebDriver is only used when a page does not contain the product
+    table in its HTML (e.g. when it is rendered by JavaScript).
+
     For markets with unique website structures (e.g., Vero), subclasses should
     override the `scrape` method to implement custom logic.
     """
 
+    # Headers sent with the plain HTTP requests, so they look like the browser's
+    HTTP_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "Accept-Language": "mk,en;q=0.8",
+    }
+
+    # Seconds to wait for a plain HTTP response before using the browser
+    HTTP_TIMEOUT = 20
+
+    # Seconds the browser may spend loading a page before it is stopped
+    PAGE_LOAD_TIMEOUT = 15
+
+    # Page requests per second across all threads, and how many times a
+    # request the server rejects as overloaded (429/503) is retried
+    MAX_REQUESTS_PER_SECOND = 4
+    HTTP_RETRIES = 3
+
+    # Seconds between checks while waiting for an element in the browser
+    # (Selenium's default of 0.5 s adds up to that much idle time per wait)
+    WAIT_POLL_FREQUENCY = 0.05
+
+    # Upper bound on the number of markets scraped concurrently
+    MAX_MARKET_WORKERS = 8
+
+    # Requests the browser never needs to read the product tables. Stylesheets
+    # are still loaded: when a page has to be read in the browser, its
+    # innerText depends on them, as `.text` did before the HTTP path existed.
+    BLOCKED_URL_PATTERNS = (
+        "*.png",
+        "*.jpg",
+        "*.jpeg",
+        "*.gif",
+        "*.webp",
+        "*.svg",
+        "*.ico",
+        "*.woff",
+        "*.woff2",
+        "*.ttf",
+        "*.otf",
+        "*.mp4",
+        "*.webm",
+        "*google-analytics*",
+        "*googletagmanager*",
+        "*doubleclick*",
+        "*facebook.net*",
+    )
+
+    # Used by `_is_raw_product_valid` on every scraped row: a name needs at least
+    # one letter or digit, and everything but digits and separators is stripped
+    # from a price before it is parsed
+    WORD_CHAR_RE = re.compile(r"\w")
+    NON_PRICE_CHARS_RE = re.compile(r"[^\d,.]")
+
     def __init__(
         self,
         base_url: str,
@@ -49,8 +239,8 @@ class BaseMarketScraper(ABC):
         """Initializes the BaseMarketScraper.
 
         This sets up the scraper's configuration, including the target URL,
-        market name, and browser settings. It also initializes the Selenium
-        WebDriver.
+        market name, and browser settings. The Selenium WebDriver itself is
+        only launched the first time it is needed (see `driver`).
 
         Args:
             base_url (str): The base URL of the market's price-checking website.
@@ -70,6 +260,10 @@ class BaseMarketScraper(ABC):
         self.base_url = base_url.split("?")[
             0
         ]  # Get the clean base URL without any params
+        # Listing page URL, filled in with the market ID and page number
+        self._page_url_template = (
+            f"{self.base_url}?org={{market_id}}&search=&perPage=20&page={{page_num}}"
+        )
         self.market_name = market_name
         self.browser = browser.lower()
         self.headless = headless
@@ -81,7 +275,19 @@ class BaseMarketScraper(ABC):
         # This will store details like {'id': '2', 'name': '2 Трговски - Велес'}
         self.market_details: List[Dict[str, str]] = []
 
-        self.logger.info(f"Initializing WebDriver for browser: {self.browser}")
+        # One HTTP session per scraping thread, so each reuses its connection;
+        # all of them are kept so `close` can release them
+        self._thread_local = threading.local()
+        self._sessions: List[requests.Session] = []
+        # Guards the shared WebDriver and product counter across market threads
+        self._driver_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        # Replaces a fixed delay after every page; only waits when needed
+        self._rate_limiter = RateLimiter(self.MAX_REQUESTS_PER_SECOND)
+
+        # Launched on first access of `driver`
+        self._driver: Optional[WebDriver] = None
+
         options = None
         if self.browser == "chrome":
             options = ChromeOptions()
@@ -98,20 +304,104 @@ class BaseMarketScraper(ABC):
             options.add_argument("--window-size=1920,1080")
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
+            # Images and web fonts are never needed to read the tables;
+            # stylesheets still load, since the rendered text depends on them
+            if isinstance(options, FirefoxOptions):
+                options.set_preference("permissions.default.image", 2)
+                options.set_preference("gfx.downloadable_fonts.enabled", False)
+            else:
+                options.add_experimental_option(
+                    "prefs", {"profile.managed_default_content_settings.images": 2}
+                )
+            # `get` returns once the HTML is parsed instead of after every
+            # subresource has loaded; the table is read from the DOM
+            options.page_load_strategy = "eager"
+            self._driver_options = options
+        else:
+            raise ValueError(f"Unsupported browser: {self.browser}")
+
+    @property
+    def driver(self) -> WebDriver:
+        """The Selenium WebDriver, launched the first time it is accessed.
 
+        Pages that can be fetched over plain HTTP never need the browser, so a
+        scrape that does not fall back to it skips the browser launch entirely.
+
+        Returns:
+            WebDriver: The scraper's WebDriver instance.
+        """
+        if self._driver is None:
+            self.logger.info(f"Initializing WebDriver for browser: {self.browser}")
             # Initialize the appropriate WebDriver based on the selected browser
             # This uses a nested ternary operator to select the correct driver class
-            self.driver = (
-                webdriver.Chrome(options=options)
+            self._driver = (
+                webdriver.Chrome(options=self._driver_options)
                 if self.browser == "chrome"
                 else (
-                    webdriver.Edge(options=options)
+                    webdriver.Edge(options=self._driver_options)
                     if self.browser == "edge"
-                    else webdriver.Firefox(options=options)
+                    else webdriver.Firefox(options=self._driver_options)
                 )
             )
-        else:
-            raise ValueError(f"Unsupported browser: {self.browser}")
+            self._driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
+            if self.browser in ("chrome", "edge"):
+                self._block_heavy_resources(self._driver)
+        return self._driver
+
+    def _block_heavy_resources(self, driver: WebDriver) -> None:
+        """Stops a Chromium-based browser from downloading unneeded resources.
+
+        Images, fonts, media and trackers matching `BLOCKED_URL_PATTERNS` are
+        blocked through the DevTools protocol, so each page load only fetches
+        what is needed to render the tables.
+
+        Args:
+            driver (WebDriver): A Chrome or Edge WebDriver.
+        """
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": list(self.BLOCKED_URL_PATTERNS)}
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not block heavy resources in the browser: {e}")
+
+    def _browser_get(self, url: str) -> None:
+        """Loads a URL in the browser, starting a new one if its session was lost.
+
+        A page that takes longer than `PAGE_LOAD_TIMEOUT` to load is stopped,
+        and the caller's waits decide whether what has loaded is usable.
+
+        Args:
+            url (str): The URL to load.
+        """
+        self._rate_limiter.wait()
+        try:
+            try:
+                self.driver.get(url)
+            except InvalidSessionIdException:
+                self.logger.warning("Browser session was lost. Starting a new browser.")
+                # Quit the lost session's browser so its process does not linger
+                with contextlib.suppress(WebDriverException):
+                    self._driver.quit()
+                self._driver = None
+                self.driver.get(url)
+        except TimeoutException:
+            self.logger.warning(f"Loading {url} timed out. Stopping the page load.")
+            self.driver.execute_script("window.stop();")
+
+    def _wait(self, timeout: float) -> WebDriverWait:
+        """Returns a wait on the current browser that polls every `WAIT_POLL_FREQUENCY`.
+
+        Args:
+            timeout (float): Seconds to wait before raising a TimeoutException.
+
+        Returns:
+            WebDriverWait: The wait, bound to the browser currently in use.
+        """
+        return WebDriverWait(
+            self.driver, timeout, poll_frequency=self.WAIT_POLL_FREQUENCY
+        )
 
     def __enter__(self):
         """_summary_
@@ -135,23 +425,166 @@ class BaseMarketScraper(ABC):
         """
         self.close()
 
+    def _get_session(self) -> requests.Session:
+        """Returns the HTTP session of the current thread, creating it if needed.
+
+        Returns:
+            requests.Session: A session with `HTTP_HEADERS` set.
+        """
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.HTTP_HEADERS)
+            self._thread_local.session = session
+            with self._count_lock:
+                self._sessions.append(session)
+        return session
+
+    def _http_get(self, url: str) -> requests.Response:
+        """Requests a URL over HTTP, backing off while the server is overloaded.
+
+        Requests are spaced out by the scraper's rate limiter. A 429 or 503
+        response is retried up to `HTTP_RETRIES` times, waiting 1, 2, 4...
+        seconds (at most 30) before each retry, or longer if the response's
+        Retry-After header asks for it.
+
+        Args:
+            url: The URL to request.
+
+        Returns:
+            The last response received.
+
+        Raises:
+            requests.RequestException: If the request itself fails.
+        """
+        self._rate_limiter.wait()
+        response = self._get_session().get(url, timeout=self.HTTP_TIMEOUT)
+        for attempt in range(self.HTTP_RETRIES):
+            if response.status_code not in _RETRY_STATUS_CODES:
+                break
+            delay = min(2**attempt, 30)
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            self.logger.warning(
+                f"{url} returned status {response.status_code}. Retrying in {delay} s."
+            )
+            time.sleep(delay)
+            self._rate_limiter.wait()
+            response = self._get_session().get(url, timeout=self.HTTP_TIMEOUT)
+        return response
+
+    @staticmethod
+    def _element_text(element: html.HtmlElement) -> str:
+        """Returns an element's text the way the browser's innerText renders it.
+
+        Runs of whitespace collapse to a single space, `<br>` tags become line
+        breaks, and block elements start on a line of their own (after a blank
+        line for `<p>`), so the texts and the keys built from headers match the
+        browser-based scrape. Stylesheets are not applied, so text hidden or
+        transformed by CSS is read as it appears in the HTML.
+
+        Args:
+            element: The lxml element to read.
+
+        Returns:
+            The element's stripped, rendered text.
+        """
+        text = _COLLAPSIBLE_WHITESPACE_RE.sub(" ", "".join(_iter_element_text(element)))
+        text = _BLOCK_BREAKS_RE.sub(
+            lambda match: "\n\n" if _PARAGRAPH_BREAK in match.group() else "\n",
+            text,
+        )
+        return re.sub(f" ?{_LINE_BREAK} ?", "\n", text).strip()
+
+    @staticmethod
+    def _parse_html(response: requests.Response) -> html.HtmlElement:
+        """Parses an HTTP response as HTML.
+
+        The charset from the Content-Type header is passed to lxml, which would
+        otherwise only look for a `<meta>` declaration and fall back to Latin-1.
+
+        Args:
+            response: The response to parse.
+
+        Returns:
+            The parsed HTML document.
+        """
+        _, _, charset = response.headers.get("Content-Type", "").partition("charset=")
+        encoding = charset.split(";")[0].strip(" \"'") or None
+        return html.fromstring(
+            response.content, parser=html.HTMLParser(encoding=encoding)
+        )
+
+    def _fetch_document(self, url: str) -> Optional[html.HtmlElement]:
+        """Fetches a page over plain HTTP and parses it with lxml.
+
+        Args:
+            url: The URL of the page to fetch.
+
+        Returns:
+            The parsed HTML document, or None if the request or parsing failed
+            and the page should be loaded in the browser instead.
+
+        Raises:
+            requests.HTTPError: If the server is still overloaded (429 or 503)
+                after the retries. Loading the page in the browser would only
+                add to its load.
+        """
+        try:
+            response = self._http_get(url)
+        except requests.RequestException as e:
+            self.logger.warning(f"Could not fetch {url} over HTTP: {e}")
+            return None
+        if response.status_code in _RETRY_STATUS_CODES:
+            response.raise_for_status()
+
+        try:
+            response.raise_for_status()
+            return self._parse_html(response)
+        except (requests.HTTPError, etree.ParserError) as e:
+            self.logger.warning(f"Could not fetch {url} over HTTP: {e}")
+            return None
+
     def _get_market_details(self) -> List[Dict[str, str]]:
         """
         Fetches the list of available markets from the website's main page.
 
-        This method navigates to the base URL, locates the market selection
-        dropdown, and extracts the ID and name for each market listed.
+        This method loads the base URL, locates the market selection
+        dropdown, and extracts the ID and name for each market listed. The
+        page is fetched over plain HTTP first; the browser is only used if the
+        dropdown is not found in the returned HTML.
 
         Returns:
             List[Dict[str, str]]: A list of market details. Each dictionary
                                   contains an 'id' and a 'name'. Returns an
                                   empty list on failure.
         """
-        self.logger.info("Navigating to the base URL to get market details...")
-        self.driver.get(self.base_url)
+        self.logger.info("Fetching the base URL to get market details...")
+        try:
+            document = self._fetch_document(self.base_url)
+        except requests.HTTPError as e:
+            self.logger.error(f"Could not get the market details: {e}")
+            return []
+        if document is not None:
+            markets = [
+                {"id": option.get("value"), "name": self._element_text(option)}
+                for option in document.xpath("//select[@name='org']/option")
+                if option.get("value")
+            ]
+            if markets:
+                self.logger.info(
+                    f"Successfully found {len(markets)} markets to scrape."
+                )
+                return markets
+            self.logger.info(
+                "Market dropdown not found in the HTML. Using the browser."
+            )
+
+        self._browser_get(self.base_url)
         markets = []
         try:
-            dropdown_element = WebDriverWait(self.driver, 20).until(
+            dropdown_element = self._wait(20).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "select[name='org']"))
             ) # Wait for the dropdown element to be present in the DOM (Document Object Model)
             market_dropdown = Select(dropdown_element) # Create a S elect object from the dropdown element
@@ -183,13 +616,16 @@ class BaseMarketScraper(ABC):
         limit is reached. The `per_page_limit` is also respected during
         the data extraction from individual pages.
 
+        Markets are independent, so without a `total_limit` they are scraped
+        concurrently, up to `MAX_MARKET_WORKERS` at a time. With a limit (as
+        in the DAG's default runs) they are scraped one after another, so the
+        limit keeps taking the first products in market order.
+
         Returns:
             List[str]: A list of file paths where the raw scraped data has been
                 saved. Returns an empty list if no data was scraped or saved.
         """
         self.logger.info(f"Starting scrape for {self.market_name}...")
-        all_products: List[Dict[str, Any]] = []
-        output_files: List[str] = []
 
         # 1. --- Get market details ---
         self.market_details = self._get_market_details()
@@ -197,49 +633,178 @@ class BaseMarketScraper(ABC):
             self.logger.error("Could not retrieve market details. Stopping scrape.")
             return []
 
-        # A flag to break out of the outer loop once the total limit is met
-        stop_scraping_total = False
+        # 2. --- Scrape each market, saving its products as soon as it is done ---
+        output_file = self._save_data(self._iter_market_products())
+        if output_file is None:
+            self.logger.warning("Scrape completed, but no products were found.")
+            return []
+
+        self.logger.info(f"Scrape successful. Data saved to {output_file}.")
+        return [output_file]
+
+    def _iter_market_products(self) -> Iterator[List[Dict[str, Any]]]:
+        """Scrapes the markets in `market_details`, yielding each one's products.
+
+        Only a scrape without a `total_limit` runs the markets concurrently
+        (main.py without --total-limit, or a DAG run triggered with
+        `total_limit` set to null); their products are still yielded in market
+        order. A limit keeps the first products in market order, which the
+        first market usually provides on its own, so limited scrapes such as
+        the DAG's default ones run the markets one after another instead of
+        spending requests on products that would be trimmed.
+
+        Yields:
+            The products of each market, in market order.
+        """
+        if self.total_limit is None and len(self.market_details) > 1:
+            max_workers = min(self.MAX_MARKET_WORKERS, len(self.market_details))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map keeps the market order, so the output matches a sequential run
+                yield from executor.map(self._scrape_market, self.market_details)
+            return
 
-        # 2. --- Iterate through each market ---
         for market in self.market_details:
-            if stop_scraping_total:
+            if (
+                self.total_limit is not None
+                and self.total_products_scraped >= self.total_limit
+            ):
                 break
+            yield self._scrape_market(market)
 
-            market_id = market["id"]
-            market_name_text = market["name"]
-            self.logger.info(
-                f"--- Starting scrape for Market: {market_name_text} (ID: {market_id}) ---"
+    def _scrape_market(self, market: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Scrapes every listing page of a single market location.
+
+        Args:
+            market: The market's details, with its 'id' and 'name'.
+
+        Returns:
+            The valid products of the market, in page order.
+        """
+        market_id = market["id"]
+        market_name_text = market["name"]
+        self.logger.info(
+            f"--- Starting scrape for Market: {market_name_text} (ID: {market_id}) ---"
+        )
+        products: List[Dict[str, Any]] = []
+        page_num = 1
+        # Cell texts of the rows seen in this market, so a page that the
+        # paginator repeats does not add its products twice. Kept per market,
+        # so it is released as soon as the market is done.
+        seen_rows: Set[tuple] = set()
+
+        # 3. --- Iterate through each page ---
+        while True:
+            # Check 1: TOTAL limit. If met, stop fetching new pages.
+            if (
+                self.total_limit is not None
+                and self.total_products_scraped >= self.total_limit
+            ):
+                self.logger.info(
+                    f"Total product limit of {self.total_limit} reached. Stopping all scraping."
+                )
+                break
+
+            page_url = self._page_url_template.format(
+                market_id=market_id, page_num=page_num
             )
+            self.logger.info(f"Scraping Page {page_num} from URL: {page_url}")
 
-            page_num = 1
+            # 4. --- Extract products from the market's page ---
+            page_products = self._scrape_page(
+                page_url, market_id, market_name_text, seen_rows
+            )
 
-            # 3. --- Iterate through each page ---
-            while True:
-                # Check 1: TOTAL limit. If met, stop fetching new pages.
-                if (
-                    self.total_limit is not None
-                    and self.total_products_scraped >= self.total_limit
-                ):
-                    self.logger.info(
-                        f"Total product limit of {self.total_limit} reached. Stopping all scraping."
-                    )
-                    stop_scraping_total = True
-                    break
+            # Add the collected products (if any) to the market's list
+            products.extend(page_products)
+
+            # If the extraction returned nothing, it might be because the total limit was hit
+            # inside of it. In any case, there's no need to continue with this market.
+            if (
+                not page_products
+                and self.total_limit is not None
+                and self.total_products_scraped >= self.total_limit
+            ):
+                # This ensures we break the page loop if the limit was hit mid-page
+                self.logger.info(
+                    "Total limit reached during page extraction. Stopping market scrape."
+                )
+                break
+
+            # If the page products list is empty, it means we've reached the end of the market.
+            if not page_products:  # Ова е исто како 'if len(page_products) == 0:'
+                self.logger.info("Страницата не врати продукти, се претпоставува крај.")
+                break
+
+            # Increment page number for the next loop
+            page_num += 1
 
-                page_url = f"{self.base_url}?org={market_id}&search=&perPage=20&page={page_num}"
-                self.logger.info(f"Scraping Page {page_num} from URL: {page_url}")
+        self.logger.info(
+            f"Total products scraped for market {market_name_text}: {len(products)}"
+        )
+        return products
 
-                self.driver.get(page_url)  # Navigate to the page using Selenium WebDriver's GET mechanism!
+    def _scrape_page(
+        self, page_url: str, market_id: str, market_name: str, seen_rows: Set[tuple]
+    ) -> List[Dict[str, Any]]:
+        """Loads a single listing page and extracts its products.
 
+        The page is fetched over plain HTTP and parsed with lxml. It is only
+        loaded in the browser when that does not yield the product table, e.g.
+        when the request fails or the table is rendered by JavaScript. A server
+        that is still overloaded after the retries ends the market's scrape.
+
+        Args:
+            page_url: The URL of the listing page.
+            market_id: The ID of the market location being scraped.
+            market_name: The name of the market location being scraped.
+            seen_rows: The rows already seen in this market, which are
+                skipped; the page's new rows are added to it.
+
+        Returns:
+            The valid products on the page. Returns an empty list once the
+            end of the market's pages is reached.
+        """
+        try:
+            document = self._fetch_document(page_url)
+        except requests.HTTPError as e:
+            self.logger.error(
+                f"Could not fetch {page_url}: {e}. Stopping market '{market_name}'."
+            )
+            return []
+
+        # The end-of-market message is only looked for on pages without a table
+        if document is not None:
+            tables = document.xpath(_PRODUCT_TABLE_XPATH)
+            if tables:
+                return self._extract_products_from_table(
+                    tables[0], market_id, market_name, self.per_page_limit, seen_rows
+                )
+            if _END_OF_MARKET_TEXT in document.text_content():
+                self.logger.info(
+                    f"End of products for market '{market_name}'. Moving to the next market."
+                )
+                return []
+            self.logger.info(
+                f"Product table not found in the HTML of {page_url}. Using the browser."
+            )
+
+        # The browser is shared by all market threads
+        with self._driver_lock:
+            self._browser_get(page_url)
+
+            contents = self.driver.execute_script(_TABLE_CONTENTS_SCRIPT)
+            if contents is None:
                 # Check for the end-of-market message
-                if "Нема артикли по зададените критериуми" in self.driver.page_source:
+                if self.driver.execute_script(
+                    _PAGE_CONTAINS_TEXT_SCRIPT, _END_OF_MARKET_TEXT
+                ):
                     self.logger.info(
-                        f"End of products for market '{market_name_text}'. Moving to the next market."
+                        f"End of products for market '{market_name}'. Moving to the next market."
                     )
-                    break
+                    return []
 
                 try:
-                    WebDriverWait(self.driver, 10).until(
+                    self._wait(10).until(
                         EC.visibility_of_element_located(
                             (By.CSS_SELECTOR, "div.table-responsive .table")
                         )
@@ -248,72 +813,103 @@ class BaseMarketScraper(ABC):
                     self.logger.warning(
                         f"Table not found on {page_url}. Assuming end of pages."
                     )
-                    break
+                    return []
 
-                # 4. --- Extract products from the market's page ---
-                page_products = self._extract_products_from_page(
-                    market_id, market_name_text, self.per_page_limit
-                )
+            return self._extract_products_from_page(
+                market_id, market_name, self.per_page_limit, seen_rows, contents
+            )
 
-                # Add the collected products (if any) to our main list
-                all_products.extend(page_products)
+    def _iter_valid_products(
+        self,
+        headers: List[str],
+        rows: Iterable[List[str]],
+        market_id: str,
+        market_name: str,
+        per_page_limit: Optional[int],
+        seen_rows: Set[tuple],
+    ) -> Iterator[Dict[str, Any]]:
+        """Builds the valid products of a page from its rows' cell texts.
 
-                # If the extraction returned nothing, it might be because the total limit was hit
-                # inside of it. In any case, there's no need to continue with this market.
-                if (
-                    not page_products
-                    and self.total_limit is not None
-                    and self.total_products_scraped >= self.total_limit
-                ):
-                    # This ensures we break the page loop if the limit was hit mid-page
-                    self.logger.info(
-                        "Total limit reached during page extraction. Stopping market scrape."
-                    )
-                    stop_scraping_total = True
-                    break
+        Rows are consumed lazily, so once the per-page or total limit is hit
+        no further rows are read. Rows in `seen_rows` (e.g. on a page the
+        paginator repeats) are skipped.
 
-                # If the page products list is empty, it means we've reached the end of the market.
-                if not page_products:  # Ова е исто како 'if len(page_products) == 0:'
-                    self.logger.info(
-                        "Страницата не врати продукти, се претпоставува крај."
-                    )
-                    break
-                
-                # Increment page number for the next loop
-                page_num += 1
-                random_delay()
-
-        # --- SAVING DATA AT THE END ---
-        if all_products:
-        # A final trim is good practice to strictly enforce the total_limit
-            if self.total_limit is not None and len(all_products) > self.total_limit:
-                all_products = all_products[: self.total_limit]
-
-            output_file = self._save_data(all_products)
-            output_files.append(output_file)
-            self.logger.info(
-            f"Scrape successful. Saved {len(all_products)} products to {output_file}."
-        )
-        else:
-            self.logger.warning("Scrape completed, but no products were found.")
-        
-        return output_files
+        Args:
+            headers: The product field keys, one per table column.
+            rows: The cell texts of each table row.
+            market_id: The ID of the market location being scraped.
+            market_name: The name of the market location being scraped.
+            per_page_limit: The maximum number of products to take from this
+                page, or None for no per-page limit.
+            seen_rows: The cell texts of the rows already seen in this market;
+                each new row is added to it.
 
-    def _extract_products_from_page(
-        self, market_id: str, market_name: str, per_page_limit: Optional[int]
+        Yields:
+            A dictionary for each product that passes the raw validation.
+        """
+        page_count = 0
+        for cells in rows:
+            # Check 1: The ABSOLUTE total limit. If this is hit, we are done completely.
+            if (
+                self.total_limit is not None
+                and self.total_products_scraped >= self.total_limit
+            ):
+                self.logger.info(
+                    f"Total limit ({self.total_limit}) reached. Stopping all extractions."
+                )
+                return
+
+            # Check 2: The limit FOR THIS PAGE ONLY.
+            if per_page_limit is not None and page_count >= per_page_limit:
+                self.logger.info(
+                    f"Per-page limit of {per_page_limit} reached for this page. Moving on."
+                )
+                return
+
+            row_key = tuple(cells)
+            if row_key in seen_rows:
+                continue
+            seen_rows.add(row_key)
+
+            item = {headers[i]: cells[i] for i in range(len(cells))}
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Raw product data: %s", item)
+
+            # --- Raw Validation Step ---
+            if not self._is_raw_product_valid(item):
+                continue  # Skip this product if it's invalid
+
+            item["market_id"] = market_id
+            item["market_name"] = market_name
+            item["scraped_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            # Increment the master counter only after successfully adding a product
+            with self._count_lock:
+                self.total_products_scraped += 1
+            page_count += 1
+            yield item
+
+    def _extract_products_from_table(
+        self,
+        table: html.HtmlElement,
+        market_id: str,
+        market_name: str,
+        per_page_limit: Optional[int],
+        seen_rows: Set[tuple],
     ) -> List[Dict[str, Any]]:
-        """Extracts all product data from the currently loaded page.
+        """Extracts all product data from a product table parsed with lxml.
 
-        This method iterates through each row of the product table on the current
-        page, extracting the data for each product. It respects both the
-        per-page and total scraping limits.
+        This is the lxml counterpart of `_extract_products_from_page` and
+        applies the same limits and raw validation.
 
         Args:
+            table: The product table element of the page.
             market_id: The ID of the market location being scraped.
             market_name: The name of the market location being scraped.
             per_page_limit: The maximum number of products to extract from this
                 page. If None, all products on the page are extracted (up to
                 the total limit).
+            seen_rows: The rows already seen in this market, which are
+                skipped; the page's new rows are added to it.
 
         Returns:
             A list of dictionaries, where each dictionary represents a
@@ -330,94 +926,148 @@ class BaseMarketScraper(ABC):
             return []
 
         try:
-            # Check if the page contains a message indicating no data is available
-            no_data_elements = self.driver.find_elements(
-                By.XPATH, "//td[contains(text(), 'Нема податоци за прикажување')]"
-            )
-
-            if no_data_elements:
+            row_elements = table.xpath(".//tbody//tr")
+            # The no-data message fills the table's only row, so pages with
+            # more rows are not searched for it
+            if len(row_elements) <= 1 and table.xpath(
+                ".//td[contains(text(), $text)]", text=_NO_DATA_TEXT
+            ):
                 self.logger.info(
                     f"No data found for market '{market_name}'. Stopping collection."
                 )
                 return []
 
-            rows = self.driver.find_elements(
-                By.CSS_SELECTOR, "div.table-responsive .table tbody tr"
-            )
-            if not rows:
-                return []
-
-            table = self.driver.find_element(
-                By.CSS_SELECTOR, "div.table-responsive .table"
-            )
             headers = [
-                th.text.strip().lower().replace(" ", "_").replace("\n", "_")
-                for th in table.find_elements(By.CSS_SELECTOR, "thead th")
+                _header_key(self._element_text(th))
+                for th in table.xpath(".//thead//th")
             ]
+            rows = (
+                [self._element_text(cell) for cell in row.iter("td")]
+                for row in row_elements
+            )
+            for product in self._iter_valid_products(
+                headers, rows, market_id, market_name, per_page_limit, seen_rows
+            ):
+                products.append(product)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to extract products for market {market_id}: {e}", exc_info=True
+            )
 
-            for row in rows:
-                # Check 1: The ABSOLUTE total limit. If this is hit, we are done completely.
-                if (
-                    self.total_limit is not None
-                    and self.total_products_scraped >= self.total_limit
-                ):
-                    self.logger.info(
-                        f"Total limit ({self.total_limit}) reached. Stopping all extractions."
-                    )
-                    return products
+        return products
 
-                # Check 2: The limit FOR THIS PAGE ONLY.
-                # If we have collected enough products from this page, break the loop and move to the next page.
-                if per_page_limit is not None and len(products) >= per_page_limit:
-                    self.logger.info(
-                        f"Per-page limit of {per_page_limit} reached for this page. Moving on."
-                    )
-                    break  # This breaks the 'for row in rows' loop
-
-                # --- If no limits are hit, process the row ---
-                cells = row.find_elements(By.TAG_NAME, "td")
-
-                # check if
-                item = {headers[i]: cells[i].text.strip() for i in range(len(cells))}
-                # add log for item
-                self.logger.debug(f"Raw product data: {item}")
-
-                # --- Raw Validation Step ---
-                if not self._is_raw_product_valid(item):
-                    continue  # Skip this product if it's invalid
-                # --- End Raw Validation ---
-
-                item["market_id"] = market_id
-                item["market_name"] = market_name
-                item["scraped_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-                products.append(item)
-                # Increment the master counter only after successfully adding a product
-                self.total_products_scraped += 1
+    def _extract_products_from_page(
+        self,
+        market_id: str,
+        market_name: str,
+        per_page_limit: Optional[int],
+        seen_rows: Set[tuple],
+        contents: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Extracts all product data from the page currently loaded in the browser.
+
+        The texts of the whole product table are read with one JavaScript call,
+        then each row is turned into a product. It respects both the per-page
+        and total scraping limits.
+
+        Args:
+            market_id: The ID of the market location being scraped.
+            market_name: The name of the market location being scraped.
+            per_page_limit: The maximum number of products to extract from this
+                page. If None, all products on the page are extracted (up to
+                the total limit).
+            seen_rows: The rows already seen in this market, which are
+                skipped; the page's new rows are added to it.
+            contents: The table texts already read with `_TABLE_CONTENTS_SCRIPT`,
+                or None to read them from the page.
+
+        Returns:
+            A list of dictionaries, where each dictionary represents a
+            scraped product. Returns an empty list if no products are found
+            or if the total scraping limit has already been reached.
+        """
+        products: List[Dict[str, Any]] = []
+
+        # Return immediately if the total limit is already met
+        if (
+            self.total_limit is not None
+            and self.total_products_scraped >= self.total_limit
+        ):
+            return []
+
+        try:
+            if contents is None:
+                contents = self.driver.execute_script(_TABLE_CONTENTS_SCRIPT)
+            if not contents or not contents["rows"]:
+                return []
+            rows = [[cell.strip() for cell in row] for row in contents["rows"]]
+
+            # Check if the table holds a message indicating no data is available;
+            # it fills the table's only row
+            if len(rows) == 1 and any(_NO_DATA_TEXT in cell for cell in rows[0]):
+                self.logger.info(
+                    f"No data found for market '{market_name}'. Stopping collection."
+                )
+                return []
+
+            headers = [_header_key(header) for header in contents["headers"]]
+            for product in self._iter_valid_products(
+                headers, rows, market_id, market_name, per_page_limit, seen_rows
+            ):
+                products.append(product)
 
         except Exception as e:
             self._handle_error(e, f"extracting_products_from_market_{market_id}")
 
-        # add log for total products scraped for this market
-        self.logger.info(
-            f"Total products scraped for market {market_name}: {self.total_products_scraped}"
-        )
         return products
 
-    def _save_data(self, data: List[Dict[str, Any]]) -> str:
-        """Saves scraped data to a JSON file.
+    def _save_data(self, batches: Iterable[List[Dict[str, Any]]]) -> Optional[str]:
+        """Saves scraped data to a JSON file, one batch at a time.
+
+        Each batch is appended to the JSON array as soon as it is produced, so
+        only the batch being written is held in memory. The array is written to
+        a temporary file that replaces the output file once it is complete, so
+        an interrupted scrape never leaves a truncated file behind. At most
+        `total_limit` products are saved.
 
         Args:
-            data: A list of dictionaries, where each dictionary represents a
+            batches: Lists of dictionaries, where each dictionary represents a
                 scraped product.
 
         Returns:
-            The file path where the data was saved.
+            The file path where the data was saved, or None if there were no
+            products to save.
         """
-        filename = f"outputs/{self.market_name.lower()}_raw_data.json"
+        filename = os.path.join(
+            OUTPUT_DIR, f"{self.market_name.lower()}_raw_data.json"
+        )
+        temp_filename = f"{filename}.tmp"
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        self.logger.info(f"Successfully saved {len(data)} items to {filename}")
+        saved_count = 0
+        try:
+            with open(temp_filename, "wb") as f:
+                f.write(b"[")
+                for batch in batches:
+                    if self.total_limit is not None:
+                        batch = batch[: self.total_limit - saved_count]
+                    if not batch:
+                        continue
+                    # orjson writes UTF-8 directly, so Cyrillic stays readable
+                    f.write(b",\n" if saved_count else b"\n")
+                    f.write(b",\n".join(map(orjson.dumps, batch)))
+                    saved_count += len(batch)
+                f.write(b"\n]\n" if saved_count else b"]\n")
+        except BaseException:
+            # open() itself may have failed, leaving no temporary file
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp_filename)
+            raise
+
+        if not saved_count:
+            os.remove(temp_filename)
+            return None
+        os.replace(temp_filename, filename)
+        self.logger.info(f"Successfully saved {saved_count} items to {filename}")
         return filename
 
     def _handle_error(self, e: Exception, context: str):
@@ -427,19 +1077,26 @@ class BaseMarketScraper(ABC):
             e (Exception): The exception that occurred.
             context (str): The context in which the error occurred.
         """
+        # Without a running browser there is no page state to capture
+        if self._driver is None:
+            self.logger.error(f"An error occurred during {context}: {e}", exc_info=True)
+            return
         # This is a helper function that handles Selenium errors
         #  saving a screenshot of the current browser state for debugging purposes.
-        handle_selenium_error(self.driver, self.logger, e, context)
+        handle_selenium_error(self._driver, self.logger, e, context)
 
     def close(self):
-        """Closes the Selenium WebDriver.
+        """Closes the HTTP sessions and the Selenium WebDriver, if it was launched.
 
         This method ensures that the browser is properly closed and its resources
         are freed. It is automatically called when exiting a `with` block or when
         the scraper instance is explicitly closed.
         """
-        if hasattr(self, "driver") and self.driver:
-            self.driver.quit()
+        for session in getattr(self, "_sessions", []):
+            session.close()
+        if getattr(self, "_driver", None) is not None:
+            self._driver.quit()
+            self._driver = None
             self.logger.info("Browser closed.") 
 
     def _is_raw_product_valid(self, product: Dict[str, Any]) -> bool:
@@ -465,7 +1122,7 @@ class BaseMarketScraper(ABC):
             return False
 
         # 2. Product name must contain at least one letter or number
-        if not re.search(r"[\w]", name, re.UNICODE):
+        if not self.WORD_CHAR_RE.search(name):
             self.logger.warning(
                 f"Skipping product with name containing only special characters: '{name}'"
             )
@@ -479,7 +1136,9 @@ class BaseMarketScraper(ABC):
         # 4. Prices must be positive numbers
         try:
             # A simple helper to clean the price string for validation
-            price_clean = re.sub(r"[^\d,.]", "", current_price_str).replace(",", ".")
+            price_clean = self.NON_PRICE_CHARS_RE.sub("", current_price_str).replace(
+                ",", "."
+            )
             price_val = float(price_clean)
             if price_val <= 0:
                 self.logger.warning(
@@ -1,17 +1,41 @@
 # -*- coding: utf-8 -*-
-from .base_market_scraper import BaseMarketScraper
-from typing import List, Dict, Any, Optional
+from .base_market_scraper import BaseMarketScraper, _RETRY_STATUS_CODES
+from typing import List, Dict, Any, Iterator, Optional, Set
 import time
 import re
 import logging
 import json
 import os
+from config.settings import OUTPUT_DIR
 from src.utils.helpers import random_delay
 from urllib.parse import urljoin
+import requests
+from lxml import etree
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# XPath equivalent of the 'table[style*="font-size: 13"]' CSS selector
+_PRODUCT_TABLE_XPATH = '//table[contains(@style, "font-size: 13")]'
+
+# Reads the header and cell texts of a market's product table in a single
+# WebDriver call, instead of one round trip per header, row and cell
+_PRODUCT_TABLE_SCRIPT = """
+const table = document.querySelector('table[style*="font-size: 13"]');
+if (!table) {
+    return null;
+}
+const texts = (root, selector) =>
+    Array.from(root.querySelectorAll(selector), (element) => element.innerText);
+const headerRow = table.querySelector('tr[bgcolor="silver"]');
+return {
+    headers: headerRow ? texts(headerRow, "th") : [],
+    rows: Array.from(
+        table.querySelectorAll('tr:not([bgcolor="silver"])'),
+        (row) => texts(row, "td")
+    ),
+};
+"""
+
 
 class VeroScraper(BaseMarketScraper):
     """A scraper for the Vero supermarket website."""
@@ -62,24 +86,33 @@ class VeroScraper(BaseMarketScraper):
             self.logger.error("No market URLs found. Aborting scrape.")
             return []
 
-        all_market_products = []
-        for url in market_urls:
-            if self.total_limit and self.total_products_scraped >= self.total_limit:
-                self.logger.info("Total product limit reached. Stopping scrape.")
-                break
-            # 2. --- Scrape products from the market's page ---
-            products_from_url = self._scrape_products_from_url(url)
-            all_market_products.extend(products_from_url)
-
-        if not all_market_products:
+        # Each market's products are saved to a single file as soon as it is done
+        output_file = self._save_data(self._iter_url_products(market_urls))
+        if output_file is None:
             self.logger.warning("Scraping complete, but no products were found.")
             return []
 
-        # Save the aggregated data to a single file
-        output_file = self._save_data(all_market_products)
         self.logger.info(f"Vero scrape process finished. Data saved to {output_file}")
         return [output_file]
 
+    def _iter_url_products(
+        self, market_urls: List[str]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Scrapes the given market URLs one by one, yielding each one's products.
+
+        Args:
+            market_urls (List[str]): The URLs of the markets' first product pages.
+
+        Yields:
+            List[Dict[str, Any]]: The products scraped from each market.
+        """
+        for url in market_urls:
+            if self.total_limit and self.total_products_scraped >= self.total_limit:
+                self.logger.info("Total product limit reached. Stopping scrape.")
+                break
+            # 2. --- Scrape products from the market's page ---
+            yield self._scrape_products_from_url(url)
+
     def _get_market_urls(self, retries: int = 3) -> list:
         """Finds all individual market links on the homepage.
 
@@ -92,13 +125,13 @@ class VeroScraper(BaseMarketScraper):
             list: A list of URLs (str) for each market found on the homepage.
         """
         self.logger.info("Navigating to the base URL to find market links...")
-        self.driver.get(self.base_url)
+        self._browser_get(self.base_url)
 
         for attempt in range(retries):
             try:
                 # Attempt to click the cookie consent button if it exists
                 try:
-                    cookie_button = WebDriverWait(self.driver, 10).until(
+                    cookie_button = self._wait(10).until(
                         EC.element_to_be_clickable(
                             (By.XPATH, "//button[contains(text(), 'Прифати ги сите')]")
                         )
@@ -114,7 +147,7 @@ class VeroScraper(BaseMarketScraper):
                     )
 
                 # Wait until at least one market link is present
-                WebDriverWait(self.driver, 20).until(
+                self._wait(20).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "table a[href$='.html']")
                     )
@@ -172,7 +205,7 @@ class VeroScraper(BaseMarketScraper):
                                 )
 
                 # Save the market map to a file
-                map_path = "outputs/vero_market_map.json"
+                map_path = os.path.join(OUTPUT_DIR, "vero_market_map.json")
                 os.makedirs(os.path.dirname(map_path), exist_ok=True)
                 with open(map_path, "w", encoding="utf-8") as f:
                     json.dump(self.market_code_to_name, f, ensure_ascii=False, indent=4)
@@ -219,6 +252,9 @@ class VeroScraper(BaseMarketScraper):
 
         match = re.search(r"/(\d+)_", url)
         market_code = match.group(1) if match else "unknown"
+        # Cell texts of the rows seen in this market, so a repeated page does
+        # not add its products twice
+        seen_rows: Set[tuple] = set()
 
         while True:
             # Check if total limit has been reached before fetching a new page
@@ -233,13 +269,21 @@ class VeroScraper(BaseMarketScraper):
 
             self.logger.info(f"Scraping page: {current_url}")
 
-            # 3. --- Navigate to the page ---
-            success = self._navigate_to_page(current_url) 
-            if not success:
-                break
+            # The pages are static HTML, so they are fetched without the browser
+            # unless that fails
+            page_products = self._fetch_page_products(
+                current_url, market_code, seen_rows
+            )
+            if page_products is None:
+                # 3. --- Navigate to the page ---
+                success = self._navigate_to_page(current_url)
+                if not success:
+                    break
 
-            # 4. --- Extract products from the market's page ---
-            page_products = self._extract_products_from_page(market_code)
+                # 4. --- Extract products from the market's page ---
+                page_products = self._extract_products_from_page(
+                    market_code, seen_rows
+                )
 
             if not page_products:
                 self.logger.info(
@@ -251,13 +295,78 @@ class VeroScraper(BaseMarketScraper):
 
             page_num += 1
             current_url = re.sub(r"_\d+\.html$", f"_{page_num}.html", current_url)
-            random_delay()
 
         self.logger.info(
             f"Finished scraping for market code '{market_code}' from URL '{url}'. Found {len(all_products)} products."
         )
         return all_products
 
+    def _fetch_page_products(
+        self, url: str, market_code: str, seen_rows: Set[tuple]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetches a product page over plain HTTP and extracts its products.
+
+        Args:
+            url (str): The URL of the product page.
+            market_code (str): The code of the market being scraped.
+            seen_rows (Set[tuple]): The rows already seen in this market, which
+                are skipped; the page's new rows are added to it.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The valid products on the page, an
+                empty list if the page does not exist (the end of the market's
+                pages) or the server is still overloaded after the retries, or
+                None if the page has to be loaded in the browser.
+        """
+        try:
+            response = self._http_get(url)
+        except requests.RequestException as e:
+            self.logger.warning(f"Could not fetch {url} over HTTP: {e}")
+            return None
+
+        if response.status_code == 404:
+            self.logger.info(
+                f"Page {url} returned 404. This is the end of the pages for this market."
+            )
+            return []
+        if response.status_code in _RETRY_STATUS_CODES:
+            # Loading the page in the browser would only add to the load
+            self.logger.error(
+                f"Fetching {url} still returned status {response.status_code} "
+                f"after the retries. Stopping market {market_code}."
+            )
+            return []
+        if not response.ok:
+            self.logger.warning(
+                f"Fetching {url} over HTTP returned status {response.status_code}."
+            )
+            return None
+
+        try:
+            document = self._parse_html(response)
+        except etree.ParserError as e:
+            self.logger.warning(f"Could not parse the HTML of {url}: {e}")
+            return None
+
+        tables = document.xpath(_PRODUCT_TABLE_XPATH)
+        if not tables:
+            self.logger.info(
+                f"Product table not found in the HTML of {url}. Using the browser."
+            )
+            return None
+
+        header_rows = tables[0].xpath('.//tr[@bgcolor="silver"]')
+        headers = (
+            [self._element_text(th) for th in header_rows[0].iter("th")]
+            if header_rows
+            else []
+        )
+        rows = [
+            [self._element_text(cell) for cell in row.iter("td")]
+            for row in tables[0].xpath('.//tr[not(@bgcolor="silver")]')
+        ]
+        return self._collect_products(headers, rows, market_code, seen_rows)
+
     def _navigate_to_page(self, url: str, retries: int = 3) -> bool:
         """Navigates to a URL and waits for the product table, with retries.
 
@@ -270,8 +379,8 @@ class VeroScraper(BaseMarketScraper):
         """
         for attempt in range(retries):
             try:
-                self.driver.get(url) # Navigate to the page using Selenium WebDriver's GET mechanism!
-                WebDriverWait(self.driver, 10).until(
+                self._browser_get(url) # Navigate to the page using Selenium WebDriver's GET mechanism!
+                self._wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, 'table[style*="font-size: 13"]')
                     )
@@ -350,7 +459,7 @@ class VeroScraper(BaseMarketScraper):
             return False
 
         # 2. Product name must contain at least one letter or number
-        if not re.search(r"[\w]", name, re.UNICODE):
+        if not self.WORD_CHAR_RE.search(name):
             self.logger.warning(
                 f"Skipping product with name containing only special characters: '{name}'"
             )
@@ -364,7 +473,9 @@ class VeroScraper(BaseMarketScraper):
         # 4. Prices must be positive numbers
         try:
             # A simple helper to clean the price string for validation
-            price_clean = re.sub(r"[^\d,.]", "", current_price_str).replace(",", ".")
+            price_clean = self.NON_PRICE_CHARS_RE.sub("", current_price_str).replace(
+                ",", "."
+            )
             price_val = float(price_clean)
             if price_val <= 0:
                 self.logger.warning(
@@ -380,73 +491,103 @@ class VeroScraper(BaseMarketScraper):
         # All checks passed
         return True
 
-    def _extract_products_from_page(self, market_code: str) -> List[Dict[str, Any]]:
+    def _extract_products_from_page(
+        self, market_code: str, seen_rows: Set[tuple]
+    ) -> List[Dict[str, Any]]:
         """Extracts all rows from the product table on the current page.
 
+        The texts of the whole table are read with one JavaScript call. They
+        use innerText, which matches Selenium's `.text`; textContent would
+        drop the line breaks that are part of keys such as
+        "продажна_цена\\n(со_ддв)".
+
         Args:
             market_code (str): The code of the market being scraped.
+            seen_rows (Set[tuple]): The rows already seen in this market, which
+                are skipped; the page's new rows are added to it.
 
         Returns:
             List[Dict[str, Any]]: A list of dictionaries, each representing a scraped product.
         """
-        products = []
         try:
-            table = self.driver.find_element(
-                By.CSS_SELECTOR, 'table[style*="font-size: 13"]'
+            contents = self.driver.execute_script(_PRODUCT_TABLE_SCRIPT)
+            if contents is None:
+                self.logger.error("Could not find the product table.")
+                return []
+            return self._collect_products(
+                contents["headers"], contents["rows"], market_code, seen_rows
+            )
+        except Exception as e:
+            self._handle_error(
+                e, context=f"extracting_products_from_market_{market_code}"
             )
+            return []
 
-            header_row = table.find_element(By.CSS_SELECTOR, 'tr[bgcolor="silver"]')
-            headers = [
-                th.text.strip().lower().replace(" ", "_")
-                for th in header_row.find_elements(By.TAG_NAME, "th")
-            ]
+    def _collect_products(
+        self,
+        headers: List[str],
+        rows: List[List[str]],
+        market_code: str,
+        seen_rows: Set[tuple],
+    ) -> List[Dict[str, Any]]:
+        """Builds the valid products of a page from its table texts.
 
-            if not headers:
-                self.logger.error("Could not find table headers.")
-                return []
+        Args:
+            headers (List[str]): The texts of the table's header cells.
+            rows (List[List[str]]): The cell texts of each product row.
+            market_code (str): The code of the market being scraped.
+            seen_rows (Set[tuple]): The rows already seen in this market, which
+                are skipped; the page's new rows are added to it.
 
-            rows = table.find_elements(By.XPATH, './/tr[not(@bgcolor="silver")]')
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each representing a scraped product.
+        """
+        headers = [header.strip().lower().replace(" ", "_") for header in headers]
+        if not headers:
+            self.logger.error("Could not find table headers.")
+            return []
 
-            for row in rows:
-                if (
-                    self.per_page_limit is not None
-                    and len(products) >= self.per_page_limit
-                ):
-                    self.logger.info(f"Reached per-page limit ({self.per_page_limit}).")
-                    break
+        products = []
+        for cells in rows:
+            if (
+                self.per_page_limit is not None
+                and len(products) >= self.per_page_limit
+            ):
+                self.logger.info(f"Reached per-page limit ({self.per_page_limit}).")
+                break
 
-                if (
-                    self.total_limit is not None
-                    and (self.total_products_scraped + len(products))
-                    >= self.total_limit
-                ):
-                    self.logger.info(
-                        f"Approaching total product limit ({self.total_limit}). Stopping extraction on this page."
-                    )
-                    break
+            if (
+                self.total_limit is not None
+                and (self.total_products_scraped + len(products))
+                >= self.total_limit
+            ):
+                self.logger.info(
+                    f"Approaching total product limit ({self.total_limit}). Stopping extraction on this page."
+                )
+                break
 
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) == len(headers):
-                    product_data = {
-                        headers[i]: cells[i].text.strip() for i in range(len(cells))
-                    }
+            if len(cells) == len(headers):
+                row_key = tuple(cells)
+                if row_key in seen_rows:
+                    continue
+                seen_rows.add(row_key)
 
-                    # --- Raw Validation Step ---
-                    if not self._is_raw_product_valid(product_data):
-                        continue  # Skip this product if it's invalid
-                    # --- End Raw Validation ---
+                product_data = {
+                    headers[i]: cells[i].strip() for i in range(len(cells))
+                }
 
-                    product_data["market_code"] = market_code
-                    product_data["market_name"] = self.market_code_to_name.get(
-                        market_code, "Unknown"
-                    )
-                    product_data["scraped_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-                    products.append(product_data)
-                    self.total_products_scraped += 1 # HERE
-        except Exception as e:
-            self._handle_error(
-                e, context=f"extracting_products_from_market_{market_code}"
-            )
+                # --- Raw Validation Step ---
+                if not self._is_raw_product_valid(product_data):
+                    continue  # Skip this product if it's invalid
+                # --- End Raw Validation ---
+
+                product_data["market_code"] = market_code
+                product_data["market_name"] = self.market_code_to_name.get(
+                    market_code, "Unknown"
+                )
+                product_data["scraped_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+                products.append(product_data)
+                self.total_products_scraped += 1 # HERE
 
         self.logger.info(
             f"Found {len(products)} valid products on current page for market {market_code}."
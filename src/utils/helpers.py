@@ -4,6 +4,7 @@ import logging
 from datetime import datetime
 from typing import Any, Dict
 import random
+import threading
 import time
 from selenium.webdriver.remote.webdriver import WebDriver
 
@@ -93,6 +94,33 @@ def random_delay(min_sec: float = 1.5, max_sec: float = 4.0) -> None:
     time.sleep(delay)
 
 
+class RateLimiter:
+    """Spaces out requests so that at most `rate` of them start per second.
+
+    A single limiter can be shared by several threads; a request only waits
+    when starting it right away would exceed the rate.
+    """
+
+    def __init__(self, rate: float):
+        """Initializes the RateLimiter.
+
+        Args:
+            rate (float): The maximum number of requests per second.
+        """
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self) -> None:
+        """Blocks until the next request may start."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
 def handle_selenium_error(
     driver: WebDriver, logger: logging.Logger, e: Exception, context: str
 ) -> None:
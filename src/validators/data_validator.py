@@ -5,6 +5,8 @@ import json
 import os
 from jsonschema import validate, ValidationError
 
+from config.settings import REPORTS_DIR
+
 
 class DataValidator:
     """Validates processed data and generates a quality report.
@@ -80,12 +82,12 @@ class DataValidator:
 
         # Convert DataFrame to a list of records for validation
         records = df.to_dict("records")
-        valid_records = []
+        valid_rows = []
 
         for i, record in enumerate(records):
             try:
                 validate(instance=record, schema=self.schema)
-                valid_records.append(record)
+                valid_rows.append(i)
             except ValidationError as e:
                 error_details = {
                     "record_index": i,
@@ -96,8 +98,9 @@ class DataValidator:
                 }
                 self.validation_errors.append(error_details)
 
-        # Create a new DataFrame from only the valid records
-        validated_df = pd.DataFrame(valid_records)
+        # Select the valid rows from the input rather than rebuilding from the
+        # records, so column dtypes (e.g. categoricals) are preserved
+        validated_df = df.iloc[valid_rows].reset_index(drop=True)
 
         # Generate the report before handling duplicates
         self._generate_report(original_count=len(df), market_name=market_name)
@@ -141,7 +144,7 @@ class DataValidator:
 
         # Use the market_name to create a dynamic report filename
         report_filename = f"{market_name.lower()}_validation_report.json"
-        report_path = os.path.join("outputs", "reports", report_filename)
+        report_path = os.path.join(REPORTS_DIR, report_filename)
 
         os.makedirs(os.path.dirname(report_path), exist_ok=True)
         try:
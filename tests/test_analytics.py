@@ -0,0 +1,96 @@
+"""
+Tests for the analytics reporting module.
+
+This module contains tests for `generate_summary_analytics`, focusing on the
+top 10 most and least expensive products in the report. It builds small
+DataFrames in memory and checks the JSON report written to a temporary path.
+"""
+
+import json
+
+import pandas as pd
+from src.reporting.analytics import generate_summary_analytics
+
+
+def _generate_report(tmp_path, products):
+    """Generates the analytics report for the given products and loads it.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture, where the report is written.
+        products (list): (product_name, current_price) pairs.
+
+    Returns:
+        dict: The parsed JSON report.
+    """
+    df = pd.DataFrame(products, columns=["product_name", "current_price"])
+    df["discount_percentage"] = 0.0
+    df["category"] = "Test"
+    report_path = tmp_path / "reports" / "analytics.json"
+    generate_summary_analytics(df, str(report_path))
+    return json.loads(report_path.read_text(encoding="utf-8"))
+
+
+def _names(records):
+    """Returns the product names of the report's product records."""
+    return [record["product_name"] for record in records]
+
+
+def test_top_products_with_fewer_than_ten_rows(tmp_path):
+    """Tests that all priced products are listed when there are fewer than 10.
+
+    Products without a price (NaN) are left out of both lists, which are
+    ordered by price.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture.
+    """
+    report = _generate_report(
+        tmp_path, [("B", 20.0), ("A", float("nan")), ("C", 5.0), ("D", 12.5)]
+    )
+
+    assert _names(report["top_10_expensive_products"]) == ["B", "D", "C"]
+    assert _names(report["top__10_cheapest_products"]) == ["C", "D", "B"]
+    assert report["total_products"] == 4
+
+
+def test_top_products_skip_missing_prices(tmp_path):
+    """Tests that NaN prices never take a place in the top 10.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture.
+    """
+    products = [(f"P{price}", float(price)) for price in range(1, 13)]
+    products += [("NO_PRICE_1", float("nan")), ("NO_PRICE_2", float("nan"))]
+
+    report = _generate_report(tmp_path, products)
+
+    assert _names(report["top_10_expensive_products"]) == [
+        f"P{price}" for price in range(12, 2, -1)
+    ]
+    assert _names(report["top__10_cheapest_products"]) == [
+        f"P{price}" for price in range(1, 11)
+    ]
+
+
+def test_top_products_ties_keep_row_order(tmp_path):
+    """Tests that equal prices are listed in row order, also at the cut-off.
+
+    Twelve products share the highest price, so only the first ten rows of
+    them are listed.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture.
+    """
+    products = [(f"TIED{i}", 100.0) for i in range(12)]
+    products += [("CHEAP_A", 1.0), ("CHEAP_B", 1.0), ("MID", 50.0)]
+
+    report = _generate_report(tmp_path, products)
+
+    assert _names(report["top_10_expensive_products"]) == [
+        f"TIED{i}" for i in range(10)
+    ]
+    assert _names(report["top__10_cheapest_products"]) == [
+        "CHEAP_A",
+        "CHEAP_B",
+        "MID",
+    ] + [f"TIED{i}" for i in range(7)]
@@ -0,0 +1,77 @@
+"""
+Tests for the shared helper utilities.
+
+This module contains tests for `RateLimiter`. The limiter reads the time from
+a fake clock, so the spacing of requests is checked without actually waiting.
+"""
+
+import pytest
+from src.utils import helpers
+from src.utils.helpers import RateLimiter
+
+
+class _FakeClock:
+    """A monotonic clock that only advances when something sleeps."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        """Returns the current fake time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Records the sleep and advances the fake time by it."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Provides a fake clock that `RateLimiter` reads and sleeps on.
+
+    Args:
+        monkeypatch: The pytest `monkeypatch` fixture.
+
+    Returns:
+        _FakeClock: The fake clock.
+    """
+    fake_clock = _FakeClock()
+    monkeypatch.setattr(helpers.time, "monotonic", fake_clock.monotonic)
+    monkeypatch.setattr(helpers.time, "sleep", fake_clock.sleep)
+    return fake_clock
+
+
+def test_rate_limiter_spaces_out_requests(clock):
+    """Tests that back-to-back requests start `1 / rate` seconds apart.
+
+    The first request starts right away.
+
+    Args:
+        clock: The fake clock fixture.
+    """
+    limiter = RateLimiter(4)
+    start_times = []
+    for _ in range(5):
+        limiter.wait()
+        start_times.append(clock.now)
+
+    assert clock.sleeps == pytest.approx([0.25] * 4)
+    assert start_times == pytest.approx([100.0, 100.25, 100.5, 100.75, 101.0])
+
+
+def test_rate_limiter_does_not_save_up_idle_time(clock):
+    """Tests that time spent idle does not allow a later burst of requests.
+
+    Args:
+        clock: The fake clock fixture.
+    """
+    limiter = RateLimiter(2)
+    limiter.wait()
+    clock.now += 10.0
+
+    limiter.wait()
+    limiter.wait()
+
+    assert clock.sleeps == pytest.approx([0.5])
@@ -1,14 +1,19 @@
 """
 Tests for the data processing module.
 
-This module contains a suite of tests for the `VeroDataProcessor` class.
-It uses pytest fixtures to create sample data files and verifies that the
-processor correctly processes the data into a structured format.
+This module contains a suite of tests for the `VeroDataProcessor` class and
+for the column-wise cleaning in `DataProcessor.create_product_frame` shared by
+all processors. It uses pytest fixtures to create sample data and verifies
+that the processors correctly process the data into a structured format.
 """
 
 import pandas as pd
 import pytest
+from src.processors import vero_data_processor
+from src.processors.data_processor import DataProcessor
+from src.processors.tinex_data_processor import TinexDataProcessor
 from src.processors.vero_data_processor import VeroDataProcessor
+from src.processors.zito_data_processor import ZitoDataProcessor
 
 
 @pytest.fixture
@@ -130,10 +135,10 @@ def test_process_market_data(raw_data_file):
         "product_name": "object",
         "current_price": "float64",
         "price_per_unit": "float64",
-        "unit": "object",
-        "category": "object",
+        "unit": "category",
+        "category": "category",
         "discount_percentage": "float64",
-        "store_location": "object",
+        "store_location": "category",
     }
 
     # Check that the columns are exactly as expected
@@ -144,3 +149,233 @@ def test_process_market_data(raw_data_file):
         assert (
             df[col].dtype == expected_dtype
         ), f"Column '{col}' has dtype {df[col].dtype}, expected {expected_dtype}"
+
+
+@pytest.fixture
+def raw_product_frame():
+    """Creates raw product rows covering the tricky cleaning cases.
+
+    The rows cover measurements in the name (liters with a decimal comma,
+    grams, pieces), a price-per-unit field with its own unit, a price-per-unit
+    field that only repeats the price, missing descriptions and store names,
+    and a price with a thousands separator.
+
+    Returns:
+        pd.DataFrame: The raw rows, with the columns `create_product_frame`
+            expects.
+    """
+    return pd.DataFrame(
+        [
+            ("МЛЕКО 1Л", "60,00", "75", "Млечни производи", None, "Зито 1"),
+            ("ЧОКОЛАДО 100ГР", "99", "99", " Слатки ", None, "Зито 1"),
+            ("ЈАЈЦА 10 КОМ", "120", None, "", None, " Зито 2 "),
+            ("ВИНО 0,75Л", "1,299.50", "1,500.00", None, None, None),
+            ("СИРЕЊЕ БЕЛО", "225", "250", None, "1 КГ = 450 ДЕН", "Зито 2"),
+            ("КРОАСАН", "45", None, None, "45 ден/ком", "Зито 2"),
+        ],
+        columns=[
+            "product_name",
+            "current_price",
+            "regular_price",
+            "description",
+            "price_per_unit",
+            "store_name",
+        ],
+    )
+
+
+def _expected_frame(categories, store_locations):
+    """Builds the expected output for `raw_product_frame`.
+
+    Only the category and store location depend on the market's processor.
+
+    Args:
+        categories (list): The expected category of each row.
+        store_locations (list): The expected store location of each row.
+
+    Returns:
+        pd.DataFrame: The expected frame, with plain object columns.
+    """
+    return pd.DataFrame(
+        {
+            "product_name": [
+                "МЛЕКО 1Л",
+                "ЧОКОЛАДО 100ГР",
+                "ЈАЈЦА 10 КОМ",
+                "ВИНО 0,75Л",
+                "СИРЕЊЕ БЕЛО",
+                "КРОАСАН",
+            ],
+            "current_price": [60.0, 99.0, 120.0, 1299.5, 225.0, 45.0],
+            "price_per_unit": [60.0, 990.0, 12.0, 1732.67, 225.0, 45.0],
+            "unit": ["l", "kg", "piece", "l", "kg", "piece"],
+            "category": categories,
+            "discount_percentage": [20.0, 0.0, 0.0, 13.37, 10.0, 0.0],
+            "store_location": store_locations,
+        },
+        dtype=object,
+    ).astype(
+        {"current_price": float, "price_per_unit": float, "discount_percentage": float}
+    )
+
+
+def _assert_product_frame(df, expected):
+    """Asserts the processed frame's values and its categorical columns."""
+    assert list(df.columns) == DataProcessor.FINAL_COLUMNS
+    for column in DataProcessor.CATEGORICAL_COLUMNS:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype), column
+    pd.testing.assert_frame_equal(
+        df.astype({column: object for column in DataProcessor.CATEGORICAL_COLUMNS}),
+        expected,
+    )
+
+
+def test_create_product_frame_standard_market(raw_product_frame):
+    """Tests the column-wise cleaning for a standard market (Zito).
+
+    Checks the measurements parsed from the name and from the price-per-unit
+    field, the single-piece fallback when the price-per-unit field repeats the
+    price, the description-based category with its "Uncategorized" fallback,
+    and the "Unknown Location" fallback for a missing store name.
+
+    Args:
+        raw_product_frame (pd.DataFrame): The raw rows, provided by the
+            `raw_product_frame` fixture.
+    """
+    df = ZitoDataProcessor().create_product_frame(raw_product_frame)
+
+    expected = _expected_frame(
+        categories=[
+            "Млечни производи",
+            "Слатки",
+            "Uncategorized",
+            "Uncategorized",
+            "Uncategorized",
+            "Uncategorized",
+        ],
+        store_locations=[
+            "Зито 1",
+            "Зито 1",
+            "Зито 2",
+            "Unknown Location",
+            "Зито 2",
+            "Зито 2",
+        ],
+    )
+    _assert_product_frame(df, expected)
+
+
+def test_create_product_frame_keyword_categories(raw_product_frame):
+    """Tests that Tinex infers categories from name keywords.
+
+    The description is ignored, and names without a known keyword fall back
+    to "Uncategorized".
+
+    Args:
+        raw_product_frame (pd.DataFrame): The raw rows, provided by the
+            `raw_product_frame` fixture.
+    """
+    df = TinexDataProcessor().create_product_frame(raw_product_frame)
+
+    assert df["category"].tolist() == [
+        "Млечни производи",
+        "Uncategorized",
+        "Uncategorized",
+        "Пијалоци",
+        "Млечни производи",
+        "Леб и пецива",
+    ]
+
+
+def test_create_product_frame_unknown_store_code(
+    raw_product_frame, tmp_path, monkeypatch
+):
+    """Tests Vero's store locations, including an unknown market code.
+
+    Known codes (with or without a '_' suffix) map to the market name, an
+    unknown code is kept as is, and a missing one becomes "Unknown Store".
+
+    Args:
+        raw_product_frame (pd.DataFrame): The raw rows, provided by the
+            `raw_product_frame` fixture.
+        tmp_path: The pytest `tmp_path` fixture, used as the output directory
+            holding the market map.
+        monkeypatch: The pytest `monkeypatch` fixture.
+    """
+    (tmp_path / "vero_market_map.json").write_text(
+        '{"104": "ВЕРО 7"}', encoding="utf-8"
+    )
+    monkeypatch.setattr(vero_data_processor, "OUTPUT_DIR", tmp_path)
+    raw_product_frame["store_name"] = ["104", "104_3", "999_1", "", None, "104"]
+
+    df = VeroDataProcessor().create_product_frame(raw_product_frame)
+
+    expected = _expected_frame(
+        categories=[
+            "Млечни производи",
+            "Слатки",
+            "Uncategorized",
+            "Uncategorized",
+            "Uncategorized",
+            "Uncategorized",
+        ],
+        store_locations=[
+            "ВЕРО 7",
+            "ВЕРО 7",
+            "999_1",
+            "Unknown Store",
+            "Unknown Store",
+            "ВЕРО 7",
+        ],
+    )
+    _assert_product_frame(df, expected)
+
+
+class _ScalarHookProcessor(DataProcessor):
+    """A processor that only implements the per-product hooks."""
+
+    def process_market_data(self, file_path):
+        """Not needed by the tests."""
+        raise NotImplementedError
+
+    def _get_category(self, description, product_name):
+        """Uses the first word of the product name as the category."""
+        return product_name.split()[0].title() if product_name else "Uncategorized"
+
+    def _create_store_location(self, store_name):
+        """Prefixes the store name with the market's name."""
+        return f"Маркет {store_name.strip()}" if store_name else "Unknown Location"
+
+
+def test_scalar_hooks_drive_the_frame(raw_product_frame):
+    """Tests that a processor with only the per-product hooks still works.
+
+    The default column-wise `_get_categories` and `_create_store_locations`
+    apply the hooks, so `create_product_frame` agrees with calling
+    `create_product_data` on every row.
+
+    Args:
+        raw_product_frame (pd.DataFrame): The raw rows, provided by the
+            `raw_product_frame` fixture.
+    """
+    processor = _ScalarHookProcessor()
+
+    df = processor.create_product_frame(raw_product_frame)
+
+    expected = _expected_frame(
+        categories=["Млеко", "Чоколадо", "Јајца", "Вино", "Сирење", "Кроасан"],
+        store_locations=[
+            "Маркет Зито 1",
+            "Маркет Зито 1",
+            "Маркет Зито 2",
+            "Unknown Location",
+            "Маркет Зито 2",
+            "Маркет Зито 2",
+        ],
+    )
+    _assert_product_frame(df, expected)
+    rows = [
+        processor.create_product_data(availability=None, **row)
+        for row in raw_product_frame.to_dict("records")
+    ]
+    pd.testing.assert_frame_equal(pd.DataFrame(rows), expected)
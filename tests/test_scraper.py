@@ -0,0 +1,633 @@
+"""
+Tests for the market scrapers.
+
+This module checks that a listing page read over plain HTTP and parsed with
+lxml yields the same products as the same page read in the browser. The HTTP
+session and the WebDriver are replaced by stubs: the session serves fixture
+HTML, and the driver returns the innerText a browser renders for that HTML,
+so the tests need neither network access nor a browser. It also covers the
+order in which concurrently scraped markets are saved, the backoff on
+overloaded servers, and the streaming JSON writer the scrapers save their
+products with.
+"""
+
+import json
+import re
+import threading
+import time
+
+import pytest
+import requests
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from src.scrapers import base_market_scraper
+from src.scrapers.vero_scraper import VeroScraper
+from src.scrapers.zito_scraper import ZitoScraper
+
+# A standard market listing page. The headers break their text with <br> and
+# <div> elements, and the cells hold nested inline and block elements.
+STANDARD_PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Проверка на цени</title></head>
+<body><div class="table-responsive"><table class="table table-striped">
+<thead><tr>
+  <th>Назив на стока-производ</th>
+  <th>Продажна<br>цена</th>
+  <th>Редовна цена</th>
+  <th>Опис на стока</th>
+  <th>Единечна цена</th>
+  <th><div>Достапност во</div><div>продажен објект</div></th>
+</tr></thead>
+<tbody>
+<tr>
+  <td>  МЛЕКО <b>ЗИТО</b>
+      1Л </td>
+  <td>65,00</td><td>70,00</td>
+  <td><p>Млечни</p><p>производи</p></td>
+  <td>65 ден/л</td><td>ДА</td>
+</tr>
+<tr>
+  <td>ЛЕБ&nbsp;БЕЛ 500Г</td>
+  <td>30</td><td>30</td>
+  <td><ul><li>Пекара</li> <li>Леб</li></ul></td>
+  <td>60<br>ден/кг</td><td>НЕ</td>
+</tr>
+</tbody></table></div></body></html>
+"""
+
+# What `_TABLE_CONTENTS_SCRIPT` returns for STANDARD_PAGE_HTML in a browser
+STANDARD_PAGE_TEXTS = {
+    "headers": [
+        "Назив на стока-производ",
+        "Продажна\nцена",
+        "Редовна цена",
+        "Опис на стока",
+        "Единечна цена",
+        "Достапност во\nпродажен објект",
+    ],
+    "rows": [
+        ["МЛЕКО ЗИТО 1Л", "65,00", "70,00", "Млечни\n\nпроизводи", "65 ден/л", "ДА"],
+        ["ЛЕБ\xa0БЕЛ 500Г", "30", "30", "Пекара\nЛеб", "60\nден/кг", "НЕ"],
+    ],
+}
+
+# A Vero product page, whose header keys keep their line breaks
+VERO_PAGE_HTML = """<html><body>
+<table style="font-size: 13px" border="1">
+<tr bgcolor="silver">
+  <th>Назив на стока</th>
+  <th><div>Продажна цена</div><div>(со ДДВ)</div></th>
+  <th>Редовна цена<br>(со ДДВ)</th>
+  <th>Достапност во<br>
+      продажен објект</th>
+</tr>
+<tr><td>ЈОГУРТ  1КГ</td><td>89,00</td><td>99,00</td><td>Да</td></tr>
+<tr>
+  <td><span>СИРЕЊЕ</span> <span>БЕЛО</span></td>
+  <td>450</td><td>450</td><td>Да</td>
+</tr>
+</table></body></html>
+"""
+
+# What `_PRODUCT_TABLE_SCRIPT` returns for VERO_PAGE_HTML in a browser
+VERO_PAGE_TEXTS = {
+    "headers": [
+        "Назив на стока",
+        "Продажна цена\n(со ДДВ)",
+        "Редовна цена\n(со ДДВ)",
+        "Достапност во\nпродажен објект",
+    ],
+    "rows": [
+        ["ЈОГУРТ 1КГ", "89,00", "99,00", "Да"],
+        ["СИРЕЊЕ БЕЛО", "450", "450", "Да"],
+    ],
+}
+
+
+class _StubResponse:
+    """A fixed HTTP response, standing in for `requests.Response`."""
+
+    def __init__(self, content, status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {"Content-Type": "text/html; charset=UTF-8", **(headers or {})}
+
+    def raise_for_status(self):
+        """Raises an HTTPError for error statuses, like `requests.Response`."""
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class _StubSession:
+    """Serves queued responses in place of a `requests.Session`."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requested_urls = []
+
+    def get(self, url, timeout):
+        """Records the requested URL and returns the next queued response."""
+        self.requested_urls.append(url)
+        return self.responses.pop(0)
+
+
+class _StubDriver:
+    """Stands in for a WebDriver that has a product page loaded."""
+
+    def __init__(self, contents):
+        self.contents = contents
+
+    def execute_script(self, script, *args):
+        """Returns the table texts, as the table-reading script would."""
+        return self.contents
+
+
+class _NoBrowser:
+    """Fails the test if the scraper falls back to the browser."""
+
+    def __getattr__(self, name):
+        raise AssertionError("The page should have been read over HTTP.")
+
+
+@pytest.fixture
+def make_scraper():
+    """Provides a factory for scrapers that use stubs instead of the network.
+
+    Each call returns a new scraper, so no rows are shared between the HTTP
+    and the browser scrape of the same page.
+
+    Returns:
+        callable: Takes the scraper class, and either the HTML the HTTP session
+            serves or the texts the browser returns.
+    """
+
+    def _make(scraper_class, html=None, browser_texts=None):
+        scraper = scraper_class(base_url="https://market.example/index.php")
+        if html is not None:
+            scraper._thread_local.session = _StubSession(
+                [_StubResponse(html.encode("utf-8"))]
+            )
+            scraper._driver = _NoBrowser()
+        else:
+            scraper._driver = _StubDriver(browser_texts)
+        return scraper
+
+    return _make
+
+
+def _without_timestamps(products):
+    """Returns the products without their `scraped_at` timestamps."""
+    return [
+        {key: value for key, value in product.items() if key != "scraped_at"}
+        for product in products
+    ]
+
+
+def test_standard_page_http_matches_browser(make_scraper):
+    """Tests that the HTTP and the browser scrape of a listing page agree.
+
+    Both must build the same header keys from headers split by <br> and
+    <div> elements, and the same cell texts from nested elements.
+
+    Args:
+        make_scraper: The scraper factory fixture.
+    """
+    http_scraper = make_scraper(ZitoScraper, html=STANDARD_PAGE_HTML)
+    http_products = http_scraper._scrape_page(
+        "https://market.example/index.php?org=7&page=1", "7", "Зито 7", set()
+    )
+
+    browser_scraper = make_scraper(ZitoScraper, browser_texts=STANDARD_PAGE_TEXTS)
+    browser_products = browser_scraper._extract_products_from_page(
+        "7", "Зито 7", None, set()
+    )
+
+    assert list(http_products[0]) == [
+        "назив_на_стока-производ",
+        "продажна_цена",
+        "редовна_цена",
+        "опис_на_стока",
+        "единечна_цена",
+        "достапност_во_продажен_објект",
+        "market_id",
+        "market_name",
+        "scraped_at",
+    ]
+    assert _without_timestamps(http_products) == _without_timestamps(
+        browser_products
+    )
+    assert len(http_products) == 2
+
+
+def test_vero_page_http_matches_browser(make_scraper):
+    """Tests that Vero's HTTP and browser scrape of a product page agree.
+
+    Vero's keys keep the header's line break, so a header split by <div>
+    elements must give the same key as one split by <br>.
+
+    Args:
+        make_scraper: The scraper factory fixture.
+    """
+    http_scraper = make_scraper(VeroScraper, html=VERO_PAGE_HTML)
+    http_products = http_scraper._fetch_page_products(
+        "https://market.example/104_1.html", "104", set()
+    )
+
+    browser_scraper = make_scraper(VeroScraper, browser_texts=VERO_PAGE_TEXTS)
+    browser_products = browser_scraper._extract_products_from_page("104", set())
+
+    assert list(http_products[0])[:4] == [
+        "назив_на_стока",
+        "продажна_цена\n(со_ддв)",
+        "редовна_цена\n(со_ддв)",
+        "достапност_во\nпродажен_објект",
+    ]
+    assert _without_timestamps(http_products) == _without_timestamps(
+        browser_products
+    )
+    assert len(http_products) == 2
+
+
+def test_lost_browser_session_is_quit_and_replaced(monkeypatch):
+    """Tests that a browser whose session was lost is quit before a new one starts.
+
+    Quitting the lost browser may itself fail; that must not stop the page
+    from being loaded in the new browser.
+
+    Args:
+        monkeypatch: The pytest `monkeypatch` fixture, used to launch a stub
+            browser instead of Chrome.
+    """
+    calls = []
+
+    class _LostDriver:
+        def get(self, url):
+            raise InvalidSessionIdException("invalid session id")
+
+        def quit(self):
+            calls.append("quit")
+            raise WebDriverException("chrome not reachable")
+
+    class _NewDriver:
+        def get(self, url):
+            calls.append(("get", url))
+
+        def set_page_load_timeout(self, timeout):
+            pass
+
+        def execute_cdp_cmd(self, cmd, params):
+            pass
+
+    monkeypatch.setattr(
+        base_market_scraper.webdriver, "Chrome", lambda options: _NewDriver()
+    )
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+    scraper._driver = _LostDriver()
+
+    scraper._browser_get("https://market.example/index.php?org=7&page=1")
+
+    assert calls == ["quit", ("get", "https://market.example/index.php?org=7&page=1")]
+    assert isinstance(scraper._driver, _NewDriver)
+
+
+def _products(start, count):
+    """Returns `count` raw products numbered from `start`."""
+    return [
+        {"назив_на_стока-производ": f"ПРОИЗВОД {i}", "продажна_цена": f"{i},00"}
+        for i in range(start, start + count)
+    ]
+
+
+def test_save_data_streams_batches_to_valid_json(tmp_path, monkeypatch):
+    """Tests that every batch is written, in order, to one valid JSON array.
+
+    Empty batches in between must not leave stray separators behind, and the
+    temporary file must be gone once the output file is in place.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture, holding the output directory.
+        monkeypatch: The pytest `monkeypatch` fixture.
+    """
+    monkeypatch.setattr(base_market_scraper, "OUTPUT_DIR", tmp_path / "outputs")
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+    batches = [_products(0, 2), [], _products(2, 3), _products(5, 1)]
+
+    output_file = scraper._save_data(iter(batches))
+
+    assert output_file == str(tmp_path / "outputs" / "zito_raw_data.json")
+    with open(output_file, encoding="utf-8") as f:
+        assert json.load(f) == _products(0, 6)
+    assert sorted(path.name for path in (tmp_path / "outputs").iterdir()) == [
+        "zito_raw_data.json"
+    ]
+
+
+def test_save_data_trims_to_total_limit_across_batches(tmp_path, monkeypatch):
+    """Tests that at most `total_limit` products are saved over all batches.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture, holding the output directory.
+        monkeypatch: The pytest `monkeypatch` fixture.
+    """
+    monkeypatch.setattr(base_market_scraper, "OUTPUT_DIR", tmp_path / "outputs")
+    scraper = ZitoScraper(base_url="https://market.example/index.php", total_limit=5)
+    batches = [_products(0, 2), _products(2, 2), _products(4, 2), _products(6, 2)]
+
+    output_file = scraper._save_data(iter(batches))
+
+    with open(output_file, encoding="utf-8") as f:
+        assert json.load(f) == _products(0, 5)
+
+
+@pytest.mark.parametrize("batches", [[], [[], []]])
+def test_save_data_without_products_leaves_no_file(tmp_path, monkeypatch, batches):
+    """Tests that nothing is saved, and None returned, when there are no products.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture, holding the output directory.
+        monkeypatch: The pytest `monkeypatch` fixture.
+        batches: The (empty) batches to save.
+    """
+    monkeypatch.setattr(base_market_scraper, "OUTPUT_DIR", tmp_path / "outputs")
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+
+    assert scraper._save_data(iter(batches)) is None
+    assert list((tmp_path / "outputs").iterdir()) == []
+
+
+def test_save_data_removes_the_partial_file_on_error(tmp_path, monkeypatch):
+    """Tests that a failing scrape keeps the previous output and no partial file.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture, holding the output directory.
+        monkeypatch: The pytest `monkeypatch` fixture.
+    """
+    monkeypatch.setattr(base_market_scraper, "OUTPUT_DIR", tmp_path / "outputs")
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+    previous_file = scraper._save_data(iter([_products(0, 1)]))
+
+    def _failing_batches():
+        yield _products(1, 2)
+        raise RuntimeError("scrape failed")
+
+    with pytest.raises(RuntimeError, match="scrape failed"):
+        scraper._save_data(_failing_batches())
+
+    with open(previous_file, encoding="utf-8") as f:
+        assert json.load(f) == _products(0, 1)
+    assert sorted(path.name for path in (tmp_path / "outputs").iterdir()) == [
+        "zito_raw_data.json"
+    ]
+
+
+def test_save_data_reraises_when_the_file_cannot_be_opened(tmp_path, monkeypatch):
+    """Tests that a failure to open the temporary file is raised as it is.
+
+    Args:
+        tmp_path: The pytest `tmp_path` fixture, holding the output directory.
+        monkeypatch: The pytest `monkeypatch` fixture, also used to make
+            `open` fail.
+    """
+    monkeypatch.setattr(base_market_scraper, "OUTPUT_DIR", tmp_path / "outputs")
+
+    def _failing_open(*args, **kwargs):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(base_market_scraper, "open", _failing_open, raising=False)
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+
+    with pytest.raises(PermissionError, match="read-only file system"):
+        scraper._save_data(iter([_products(0, 1)]))
+
+
+def _listing_page(market_id, page_num, pages_per_market=2, rows_per_page=3):
+    """Builds a listing page of a market, or its end-of-market page.
+
+    Args:
+        market_id (str): The ID of the market the page belongs to.
+        page_num (int): The page number.
+        pages_per_market (int): How many pages hold products.
+        rows_per_page (int): How many products each page holds.
+
+    Returns:
+        str: The page's HTML.
+    """
+    if page_num > pages_per_market:
+        end_text = base_market_scraper._END_OF_MARKET_TEXT
+        return f"<html><body><p>{end_text}</p></body></html>"
+    rows = "".join(
+        f"<tr><td>ПРОИЗВОД {market_id}-{page_num}-{i}</td><td>{i + 1},00</td></tr>"
+        for i in range(rows_per_page)
+    )
+    return (
+        '<html><body><div class="table-responsive"><table class="table">'
+        "<thead><tr><th>Назив на стока-производ</th><th>Продажна цена</th></tr>"
+        f"</thead><tbody>{rows}</tbody></table></div></body></html>"
+    )
+
+
+class _SlowListingSession:
+    """Serves listing pages, answering later markets faster than earlier ones.
+
+    The reversed delays make the markets finish out of order when they are
+    scraped concurrently.
+    """
+
+    def __init__(self, market_count):
+        self.market_count = market_count
+        self.thread_names = set()
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout):
+        """Returns the listing page the URL asks for, after a short delay."""
+        with self._lock:
+            self.thread_names.add(threading.current_thread().name)
+        market_id = re.search(r"org=(\d+)", url).group(1)
+        page_num = int(re.search(r"page=(\d+)", url).group(1))
+        time.sleep(0.01 * (self.market_count - int(market_id)))
+        return _StubResponse(_listing_page(market_id, page_num).encode("utf-8"))
+
+
+def test_concurrent_markets_keep_the_sequential_order(monkeypatch):
+    """Tests that concurrently scraped markets are yielded in market order.
+
+    The products must match those of scraping the same markets one after
+    another, even though the later markets finish first.
+
+    Args:
+        monkeypatch: The pytest `monkeypatch` fixture, used to lift the rate
+            limit for the test.
+    """
+    monkeypatch.setattr(ZitoScraper, "MAX_REQUESTS_PER_SECOND", 10_000)
+    markets = [{"id": str(i), "name": f"Зито {i}"} for i in range(6)]
+
+    def _make_scraper():
+        scraper = ZitoScraper(base_url="https://market.example/index.php")
+        scraper._driver = _NoBrowser()
+        scraper.market_details = markets
+        session = _SlowListingSession(len(markets))
+        scraper._get_session = lambda: session
+        return scraper, session
+
+    concurrent_scraper, concurrent_session = _make_scraper()
+    concurrent_products = [
+        product
+        for batch in concurrent_scraper._iter_market_products()
+        for product in batch
+    ]
+
+    sequential_scraper, _ = _make_scraper()
+    sequential_products = [
+        product
+        for market in markets
+        for product in sequential_scraper._scrape_market(market)
+    ]
+
+    assert len(concurrent_session.thread_names) > 1
+    assert len(concurrent_products) == 6 * 2 * 3
+    assert _without_timestamps(concurrent_products) == _without_timestamps(
+        sequential_products
+    )
+
+
+def test_repeated_rows_are_skipped_within_a_market_only(monkeypatch):
+    """Tests that a page the paginator repeats is not scraped twice.
+
+    The rows seen are kept per market, so another market listing the same
+    products still gets all of them.
+
+    Args:
+        monkeypatch: The pytest `monkeypatch` fixture, used to lift the rate
+            limit for the test.
+    """
+    monkeypatch.setattr(ZitoScraper, "MAX_REQUESTS_PER_SECOND", 10_000)
+    page = _listing_page("1", 1).encode("utf-8")
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+    scraper._driver = _NoBrowser()
+    session = _StubSession([_StubResponse(page) for _ in range(4)])
+    scraper._get_session = lambda: session
+
+    first_market = scraper._scrape_market({"id": "1", "name": "Зито 1"})
+    second_market = scraper._scrape_market({"id": "2", "name": "Зито 2"})
+
+    assert len(session.requested_urls) == 4
+    assert len(first_market) == len(second_market) == 3
+    assert {product["market_id"] for product in second_market} == {"2"}
+
+
+class _CountingRateLimiter:
+    """Stands in for the scraper's rate limiter, counting the waits."""
+
+    def __init__(self):
+        self.waits = 0
+
+    def wait(self):
+        """Counts the wait without blocking."""
+        self.waits += 1
+
+
+@pytest.fixture
+def backoff_scraper(monkeypatch):
+    """Provides a scraper whose retries are recorded instead of slept through.
+
+    Args:
+        monkeypatch: The pytest `monkeypatch` fixture.
+
+    Returns:
+        tuple: The scraper and the list the backoff delays are recorded in.
+    """
+    sleeps = []
+    monkeypatch.setattr(base_market_scraper.time, "sleep", sleeps.append)
+    scraper = ZitoScraper(base_url="https://market.example/index.php")
+    scraper._rate_limiter = _CountingRateLimiter()
+    return scraper, sleeps
+
+
+def test_http_get_backs_off_and_honours_retry_after(backoff_scraper):
+    """Tests that 429 and 503 responses are retried after a growing delay.
+
+    A Retry-After header longer than the backoff sets the delay instead.
+
+    Args:
+        backoff_scraper: The scraper and recorded delays fixture.
+    """
+    scraper, sleeps = backoff_scraper
+    session = _StubSession(
+        [
+            _StubResponse(b"", status_code=503, headers={"Retry-After": "5"}),
+            _StubResponse(b"", status_code=429),
+            _StubResponse(b"", status_code=429, headers={"Retry-After": "1"}),
+            _StubResponse(b"<html></html>"),
+        ]
+    )
+    scraper._thread_local.session = session
+
+    response = scraper._http_get("https://market.example/index.php")
+
+    assert response.status_code == 200
+    assert sleeps == [5.0, 2, 4]
+    assert len(session.requested_urls) == 4
+    assert scraper._rate_limiter.waits == 4
+
+
+def test_http_get_gives_up_after_the_retries(backoff_scraper):
+    """Tests that the last response is returned once the retries are used up.
+
+    Args:
+        backoff_scraper: The scraper and recorded delays fixture.
+    """
+    scraper, sleeps = backoff_scraper
+    session = _StubSession(
+        [_StubResponse(b"", status_code=503) for _ in range(scraper.HTTP_RETRIES + 2)]
+    )
+    scraper._thread_local.session = session
+
+    response = scraper._http_get("https://market.example/index.php")
+
+    assert response.status_code == 503
+    assert sleeps == [1, 2, 4]
+    assert len(session.requested_urls) == scraper.HTTP_RETRIES + 1
+
+
+def test_overloaded_listing_page_is_not_loaded_in_the_browser(backoff_scraper):
+    """Tests that a page still overloaded after the retries ends the market.
+
+    The browser would only add to the load of the server, so it must not be
+    used as a fallback.
+
+    Args:
+        backoff_scraper: The scraper and recorded delays fixture.
+    """
+    scraper, _ = backoff_scraper
+    scraper._driver = _NoBrowser()
+    session = _StubSession(
+        [_StubResponse(b"", status_code=429) for _ in range(scraper.HTTP_RETRIES + 1)]
+    )
+    scraper._thread_local.session = session
+
+    products = scraper._scrape_page(
+        "https://market.example/index.php?org=7&page=1", "7", "Зито 7", set()
+    )
+
+    assert products == []
+    assert len(session.requested_urls) == scraper.HTTP_RETRIES + 1
+
+
+def test_overloaded_vero_page_is_not_loaded_in_the_browser(backoff_scraper):
+    """Tests that a Vero page still overloaded after the retries ends the market.
+
+    Args:
+        backoff_scraper: The scraper and recorded delays fixture, used for its
+            recorded delays.
+    """
+    scraper = VeroScraper(base_url="https://market.example/")
+    scraper._rate_limiter = _CountingRateLimiter()
+    scraper._driver = _NoBrowser()
+    session = _StubSession(
+        [_StubResponse(b"", status_code=503) for _ in range(scraper.HTTP_RETRIES + 1)]
+    )
+    scraper._thread_local.session = session
+
+    products = scraper._scrape_products_from_url("https://market.example/104_1.html")
+
+    assert products == []
+    assert len(session.requested_urls) == scraper.HTTP_RETRIES + 1